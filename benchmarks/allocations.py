@@ -0,0 +1,59 @@
+"""
+Peak and kept memory of one call, with ``tracemalloc``.
+
+``measure`` runs one call with tracing on and reports the memory it needed
+on top of what already existed: the peak of newly allocated bytes,
+including temporaries freed before returning, and the bytes and numpy
+array buffers still alive afterwards, such as those of the returned object.
+Dividing the peak by the size of one input array estimates how many array
+copies the call makes.
+
+``tracemalloc`` only keeps track of memory that is still allocated, so the
+number of allocations a call makes cannot be counted: temporaries only
+show up through the peak.
+"""
+import gc
+import tracemalloc
+
+import numpy as np
+
+# numpy reports its data buffers to tracemalloc in their own domain.
+NUMPY_DOMAIN = getattr(np.lib, 'tracemalloc_domain', 389047)
+
+
+class AllocationStats:
+    """
+    Memory of one call: ``peak_bytes`` is the highest amount of newly
+    allocated memory during the call, ``kept_bytes`` the new memory still in
+    use afterwards and ``kept_arrays`` the number of new numpy data buffers
+    among it, not the number of arrays the call allocated.
+    """
+    def __init__(self, peak_bytes, kept_bytes, kept_arrays):
+        self.peak_bytes = peak_bytes
+        self.kept_bytes = kept_bytes
+        self.kept_arrays = kept_arrays
+
+    def copies(self, array_bytes):
+        """``peak_bytes`` in units of an array of ``array_bytes`` bytes."""
+        return self.peak_bytes / array_bytes
+
+
+def measure(func, *args):
+    """Call ``func(*args)`` under ``tracemalloc`` and return its stats."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    gc.collect()
+    # From here on only new allocations are traced, and the peak restarts.
+    tracemalloc.clear_traces()
+    try:
+        result = func(*args)
+        kept_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    del result
+    arrays = snapshot.filter_traces(
+        [tracemalloc.DomainFilter(True, NUMPY_DOMAIN)])
+    return AllocationStats(peak_bytes, kept_bytes, len(arrays.traces))
@@ -0,0 +1,162 @@
+"""
+Batches of light curves sharing one time axis.
+
+``LightcurveBatch`` keeps N same-length light curves as the rows of a
+single 2D counts array, so rebinning, arithmetic and spectra are one numpy
+call over all of them instead of N calls on separate ``Lightcurve``
+objects. Spectra follow the conventions of ``spectral``, with per-segment
+normalisation.
+"""
+import numpy as np
+
+from . import errors, spectral
+
+
+class LightcurveBatch:
+    """
+    N light curves on the same time bins.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        Bin times, shared by all light curves.
+    counts : np.ndarray
+        ``(N, len(time))`` counts, one light curve per row.
+    dt : float
+        Bin width.
+    counts_err : np.ndarray, optional
+        Errors on ``counts``. Poisson errors by default, as in stingray.
+    gti : np.ndarray, optional
+        Good time intervals shared by all light curves, the whole time span
+        by default.
+    """
+    def __init__(self, time, counts, dt, counts_err=None, gti=None):
+        self.time = np.asarray(time)
+        self.counts = np.atleast_2d(counts)
+        if self.counts.shape[1] != self.time.size:
+            raise ValueError("counts must have one column per time bin")
+        self.dt = dt
+        self._counts_err = counts_err
+        if gti is None:
+            gti = [[self.time[0] - dt / 2, self.time[-1] + dt / 2]]
+        self.gti = np.asarray(gti)
+
+    @classmethod
+    def from_lightcurves(cls, lcs):
+        """Stack ``Lightcurve`` objects with identical time bins."""
+        first = lcs[0]
+        for lc in lcs[1:]:
+            if not np.array_equal(lc.time, first.time):
+                raise ValueError("All light curves must share time bins")
+        return cls(first.time, np.stack([lc.counts for lc in lcs]),
+                   first.dt, np.stack([lc.counts_err for lc in lcs]),
+                   first.gti)
+
+    def __len__(self):
+        return self.counts.shape[0]
+
+    def __getitem__(self, index):
+        """Return light curve ``index`` as a ``Lightcurve``."""
+        from stingray import Lightcurve
+
+        return Lightcurve(self.time, self.counts[index],
+                          err=self.counts_err[index], gti=self.gti,
+                          dt=self.dt, skip_checks=True)
+
+    @property
+    def counts_err(self):
+        if self._counts_err is None:
+            self._counts_err = errors.poisson_errors(self.counts)
+        return self._counts_err
+
+    def rebin(self, dt_new, method='sum'):
+        """
+        Rebin every light curve to ``dt_new``, an integer multiple of
+        ``dt``, summing (``'sum'``) or averaging (``'mean'``) the counts.
+        Trailing bins that do not fill a new bin are dropped.
+        """
+        factor = int(round(dt_new / self.dt))
+        if factor < 1 or not np.isclose(factor * self.dt, dt_new):
+            raise ValueError("dt_new must be a multiple of dt")
+        n_new = self.time.size // factor
+        stop = n_new * factor
+        shape = (len(self), n_new, factor)
+        counts = self.counts[:, :stop].reshape(shape).sum(axis=-1)
+        err = self.counts_err[:, :stop].reshape(shape)
+        counts_err = np.sqrt((err * err).sum(axis=-1))
+        if method == 'mean':
+            # Not in place: integer counts average to floats.
+            counts = counts / factor
+            counts_err = counts_err / factor
+        elif method != 'sum':
+            raise ValueError("Unknown rebinning method: {}".format(method))
+        time = self.time[:stop].reshape(n_new, factor).mean(axis=-1)
+        return LightcurveBatch(time, counts, dt_new, counts_err, self.gti)
+
+    def _operation(self, other, operation):
+        if isinstance(other, LightcurveBatch) or hasattr(other, 'counts'):
+            if not np.array_equal(self.time, other.time):
+                raise ValueError("The light curves have different times")
+            counts = operation(self.counts, other.counts)
+            counts_err = np.hypot(self.counts_err, other.counts_err)
+        else:
+            counts = operation(self.counts, other)
+            counts_err = self.counts_err
+        return LightcurveBatch(self.time, counts, self.dt, counts_err,
+                               self.gti)
+
+    def __add__(self, other):
+        """Add another batch, a ``Lightcurve`` or an array to every row."""
+        return self._operation(other, np.add)
+
+    def __sub__(self, other):
+        """Subtract another batch, a ``Lightcurve`` or an array."""
+        return self._operation(other, np.subtract)
+
+    def __neg__(self):
+        return LightcurveBatch(self.time, -self.counts, self.dt,
+                               self.counts_err, self.gti)
+
+    def _segments(self, counts, segment_size):
+        n_bin = segment_size or self.time.size
+        m = self.time.size // n_bin
+        return np.reshape(counts[:, :m * n_bin], (counts.shape[0], m, n_bin))
+
+    def _fourier(self, segments):
+        n_freq = (segments.shape[-1] - 1) // 2
+        return np.fft.rfft(segments, axis=-1)[..., 1:n_freq + 1]
+
+    def _average(self, unnorm, segments1, segments2, norm):
+        m, n_bin = segments1.shape[1:]
+        sum1 = segments1.sum(axis=-1, keepdims=True)
+        sum2 = segments2.sum(axis=-1, keepdims=True)
+        power = spectral.normalize(unnorm, n_bin, self.dt, sum1 / n_bin,
+                                   sum2 / n_bin, np.sqrt(sum1 * sum2),
+                                   norm).mean(axis=1)
+        return spectral.AveragedSpectrum(
+            spectral.positive_frequencies(n_bin, self.dt), power,
+            np.abs(power) / np.sqrt(m), m, n_bin, self.dt, norm)
+
+    def powerspectrum(self, norm='frac', segment_size=None):
+        """
+        Power spectra of all light curves from one 2D FFT, averaged over
+        segments of ``segment_size`` bins if given. The result is an
+        ``AveragedSpectrum`` with one row of ``power`` per light curve.
+        """
+        segments = self._segments(self.counts, segment_size)
+        ft = self._fourier(segments)
+        return self._average((ft * ft.conj()).real, segments, segments, norm)
+
+    def crossspectrum(self, other, norm='frac', segment_size=None):
+        """
+        Cross spectra of each light curve with the matching row of another
+        batch, or with a single reference ``Lightcurve`` for all of them.
+        """
+        counts2 = np.atleast_2d(other.counts)
+        if counts2.shape[0] not in (1, len(self)) or \
+                counts2.shape[1] != self.time.size:
+            raise ValueError("The light curves have different shapes")
+        segments1 = self._segments(self.counts, segment_size)
+        segments2 = self._segments(counts2, segment_size)
+        unnorm = self._fourier(segments1).conj() * self._fourier(segments2)
+        return self._average(unnorm, segments1, segments2, norm)
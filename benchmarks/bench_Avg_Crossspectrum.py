@@ -1,13 +1,17 @@
-import numpy as np
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 try:
-    from stingray import Lightcurve, AveragedCrossspectrum
+    from stingray import AveragedCrossspectrum
 except ImportError:
     import sys
     print("Install stingray first")
     sys.exit()
 
+from . import fixtures, segments, spectral
+
 test_arr_size = [10**i for i in range(3, 7)]
+sweep_arr_size = [10**6, 10**7]
 
 
 class Init:
@@ -19,14 +23,9 @@ class Init:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        self.lc2 = Lightcurve(times,
-                              counts + np.random.rand() * 10,
-                              dt=1.0,
-                              skip_checks=True)
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
 
     def time_init(self, array_size):
         AveragedCrossspectrum(self.lc1, self.lc2, 1000, silent=True)
@@ -47,14 +46,9 @@ class Coherence:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        lc2 = Lightcurve(times,
-                         counts + np.random.rand() * 10,
-                         dt=1.0,
-                         skip_checks=True)
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
         self.avg_Cspec = AveragedCrossspectrum(lc1, lc2, 1000, silent=True)
 
     def time_coher(self, array_size):
@@ -76,14 +70,9 @@ class TimeLag:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        lc2 = Lightcurve(times,
-                         counts + np.random.rand() * 10,
-                         dt=1.0,
-                         skip_checks=True)
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
         self.avg_Cspec = AveragedCrossspectrum(lc1, lc2, 1000, silent=True)
 
     def time_Tlag(self, array_size):
@@ -94,3 +83,124 @@ class TimeLag:
 
     def teardown(self, array_size):
         del self.avg_Cspec
+
+
+class SegmentSweep:
+    """
+    Time and Memory benchmarks for initializing an averaged cross spectra
+    with power of two, 5-smooth and prime segment sizes.
+    """
+    params = [sweep_arr_size, segments.sweep_sizes()]
+    param_names = ['array_size', 'segment_size']
+    timeout = 300.0
+
+    def setup(self, array_size, segment_size):
+        if segment_size > array_size:
+            raise NotImplementedError("segment longer than lightcurve")
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
+
+    def time_init(self, array_size, segment_size):
+        AveragedCrossspectrum(self.lc1, self.lc2, segment_size, silent=True)
+
+    def peakmem_init(self, array_size, segment_size):
+        AveragedCrossspectrum(self.lc1, self.lc2, segment_size, silent=True)
+
+    def teardown(self, array_size, segment_size):
+        del self.lc1, self.lc2
+
+
+class SegmentSweepProducts:
+    """
+    Time and Memory benchmarks for the coherence and time lag of averaged
+    cross spectra with power of two, 5-smooth and prime segment sizes.
+    """
+    params = [sweep_arr_size, segments.sweep_sizes()]
+    param_names = ['array_size', 'segment_size']
+    timeout = 300.0
+
+    def setup(self, array_size, segment_size):
+        if segment_size > array_size:
+            raise NotImplementedError("segment longer than lightcurve")
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
+        self.avg_Cspec = AveragedCrossspectrum(lc1, lc2, segment_size,
+                                               silent=True)
+
+    def time_coher(self, array_size, segment_size):
+        self.avg_Cspec.coherence()
+
+    def peakmem_coher(self, array_size, segment_size):
+        self.avg_Cspec.coherence()
+
+    def time_Tlag(self, array_size, segment_size):
+        self.avg_Cspec.time_lag()
+
+    def peakmem_Tlag(self, array_size, segment_size):
+        self.avg_Cspec.time_lag()
+
+    def teardown(self, array_size, segment_size):
+        del self.avg_Cspec
+
+
+class ParallelScaling:
+    """
+    Time and Memory benchmarks for averaging cross spectra over a pool of
+    thread or process workers, with the speedup and parallel efficiency
+    relative to a single worker. Peak memory covers the parent process only.
+    """
+    params = [test_arr_size, [1, 2, 4, 8], ['thread', 'process']]
+    param_names = ['array_size', 'n_workers', 'executor']
+    timeout = 120.0
+
+    def setup(self, array_size, n_workers, executor):
+        if n_workers == 1 and executor == 'process':
+            # A single worker runs serially in the calling thread: the
+            # 'thread' case already covers it.
+            raise NotImplementedError("same serial run as with threads")
+        self.counts1 = fixtures.white_noise(array_size)
+        self.counts2 = fixtures.white_noise(array_size,
+                                            seed=fixtures.DEFAULT_SEED + 1)
+        self.pool = None
+        if n_workers > 1:
+            pool_type = {'thread': ThreadPoolExecutor,
+                         'process': ProcessPoolExecutor}[executor]
+            self.pool = pool_type(n_workers)
+            # Start the workers outside of the timed region.
+            self.average(n_workers)
+
+    def average(self, n_workers):
+        return spectral.parallel_average(self.counts1, self.counts2, 1000,
+                                         n_workers=n_workers,
+                                         executor=self.pool)
+
+    def best_time(self, n_workers, repeat=3):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self.average(n_workers)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def time_average(self, array_size, n_workers, executor):
+        self.average(n_workers)
+
+    def peakmem_average(self, array_size, n_workers, executor):
+        self.average(n_workers)
+
+    def track_speedup(self, array_size, n_workers, executor):
+        return self.best_time(1) / self.best_time(n_workers)
+
+    track_speedup.unit = 'x'
+
+    def track_efficiency(self, array_size, n_workers, executor):
+        return self.track_speedup(array_size, n_workers, executor) / n_workers
+
+    track_efficiency.unit = 'fraction'
+
+    def teardown(self, array_size, n_workers, executor):
+        if self.pool is not None:
+            self.pool.shutdown()
+        del self.counts1, self.counts2, self.pool
@@ -1,13 +1,16 @@
-import numpy as np
+import time
 
 try:
-    from stingray import Lightcurve, AveragedPowerspectrum
+    from stingray import AveragedPowerspectrum
 except ImportError:
     import sys
     print("Install stingray first")
     sys.exit()
 
+from . import fixtures, segments, spectral
+
 test_arr_size = [10**i for i in range(3, 7)]
+sweep_arr_size = [10**6, 10**7]
 
 
 class Init:
@@ -19,10 +22,7 @@ class Init:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_init(self, array_size):
         AveragedPowerspectrum(self.lc, 1000)
@@ -30,5 +30,92 @@ class Init:
     def peakmem_init(self, array_size):
         AveragedPowerspectrum(self.lc, 1000)
 
+    def track_segments_per_second(self, array_size):
+        start = time.perf_counter()
+        AveragedPowerspectrum(self.lc, 1000)
+        return (array_size // 1000) / (time.perf_counter() - start)
+
+    track_segments_per_second.unit = 'segments/s'
+
     def teardown(self, array_size):
         del self.lc
+
+
+class Streaming:
+    """
+    Time and Memory benchmarks for averaging a power spectra over segments
+    streamed from a file or a synthetic generator, one segment at a time.
+    Compare with ``Init``, which averages a whole in-memory lightcurve.
+    """
+    params = [test_arr_size, ['file', 'generator']]
+    param_names = ['array_size', 'source']
+    timeout = 120.0
+
+    def setup(self, array_size, source):
+        self.counts = fixtures.white_noise(array_size)
+
+    def segments(self, array_size, source):
+        if source == 'file':
+            return fixtures.file_segments(self.counts, 1000)
+        return fixtures.white_noise_segments(array_size // 1000, 1000)
+
+    def time_stream(self, array_size, source):
+        spectral.averaged_powerspectrum(self.segments(array_size, source),
+                                        1000)
+
+    def peakmem_stream(self, array_size, source):
+        spectral.averaged_powerspectrum(self.segments(array_size, source),
+                                        1000)
+
+    def track_segments_per_second(self, array_size, source):
+        start = time.perf_counter()
+        spectral.averaged_powerspectrum(self.segments(array_size, source),
+                                        1000)
+        return (array_size // 1000) / (time.perf_counter() - start)
+
+    track_segments_per_second.unit = 'segments/s'
+
+    def teardown(self, array_size, source):
+        del self.counts
+
+
+class SegmentSweep:
+    """
+    Time and Memory benchmarks for initializing a power spectra with power
+    of two, 5-smooth and prime segment sizes.
+    """
+    params = [sweep_arr_size, segments.sweep_sizes()]
+    param_names = ['array_size', 'segment_size']
+    timeout = 300.0
+
+    def setup(self, array_size, segment_size):
+        if segment_size > array_size:
+            raise NotImplementedError("segment longer than lightcurve")
+        self.lc = fixtures.lightcurve(array_size)
+
+    def time_init(self, array_size, segment_size):
+        AveragedPowerspectrum(self.lc, segment_size)
+
+    def peakmem_init(self, array_size, segment_size):
+        AveragedPowerspectrum(self.lc, segment_size)
+
+    def teardown(self, array_size, segment_size):
+        del self.lc
+
+
+class OptimalSegmentSize:
+    """
+    Track the fastest 5-smooth segment size (lowest FFT cost per bin) within
+    half an octave of each power of two in the segment size sweep, up to
+    the sweep's largest size.
+    """
+    params = list(segments.SWEEP_OCTAVES)
+    param_names = ['octave']
+    timeout = 300.0
+
+    def track_optimal_segment_size(self, octave):
+        return segments.optimal_segment_size(
+            int(2**(octave - 0.5)),
+            min(int(2**(octave + 0.5)), segments.MAX_SWEEP_SIZE))
+
+    track_optimal_segment_size.unit = 'bins'
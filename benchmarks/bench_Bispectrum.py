@@ -0,0 +1,42 @@
+try:
+    from stingray.bispectrum import Bispectrum
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import fixtures
+
+# The third order cumulant is a (2 maxlag + 1)**2 matrix product over the
+# whole lightcurve, so the sizes stay small.
+bispec_arr_size = [10**i for i in range(3, 5)]
+bispec_maxlag = [10, 100, 1000]
+
+
+class Init:
+    """
+    Time and Memory benchmarks for initializing a bispectrum.
+    """
+    params = [bispec_arr_size, bispec_maxlag]
+    param_names = ['array_size', 'maxlag']
+    timeout = 300.0
+
+    def setup(self, array_size, maxlag):
+        if 2 * maxlag >= array_size:
+            raise NotImplementedError("maxlag too long for the lightcurve")
+        self.lc = fixtures.lightcurve(array_size)
+
+    def time_init(self, array_size, maxlag):
+        Bispectrum(self.lc, maxlag=maxlag)
+
+    def peakmem_init(self, array_size, maxlag):
+        Bispectrum(self.lc, maxlag=maxlag)
+
+    def time_init_window(self, array_size, maxlag):
+        Bispectrum(self.lc, maxlag=maxlag, window='hanning')
+
+    def peakmem_init_window(self, array_size, maxlag):
+        Bispectrum(self.lc, maxlag=maxlag, window='hanning')
+
+    def teardown(self, array_size, maxlag):
+        del self.lc
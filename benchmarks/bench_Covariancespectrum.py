@@ -0,0 +1,57 @@
+import numpy as np
+
+try:
+    from stingray import AveragedCovariancespectrum, Covariancespectrum
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import fixtures
+
+# Photons arrive at 100 counts/s and are binned at 1 s in four energy bands.
+event_counts = [10**i for i in range(3, 7)]
+event_dt = 1e-2
+bin_dt = 1.0
+bands = np.array([[0.3, 1.], [1., 2.], [2., 4.], [4., 12.]])
+
+
+class _CovarianceBenchmark:
+    params = event_counts
+    param_names = ['n_events']
+    timeout = 120.0
+
+    def setup(self, n_events):
+        self.data = np.column_stack((
+            fixtures.poisson_events(n_events, dt=event_dt),
+            fixtures.event_energies(n_events)))
+
+    def teardown(self, n_events):
+        del self.data
+
+
+class Init(_CovarianceBenchmark):
+    """
+    Time and Memory benchmarks for a covariance spectrum of an event list.
+    """
+
+    def time_init(self, n_events):
+        Covariancespectrum(self.data, dt=bin_dt, band_interest=bands)
+
+    def peakmem_init(self, n_events):
+        Covariancespectrum(self.data, dt=bin_dt, band_interest=bands)
+
+
+class AveragedInit(_CovarianceBenchmark):
+    """
+    Time and Memory benchmarks for an averaged covariance spectrum of an
+    event list.
+    """
+
+    def time_init(self, n_events):
+        AveragedCovariancespectrum(self.data, 10, dt=bin_dt,
+                                   band_interest=bands)
+
+    def peakmem_init(self, n_events):
+        AveragedCovariancespectrum(self.data, 10, dt=bin_dt,
+                                   band_interest=bands)
@@ -0,0 +1,83 @@
+try:
+    from stingray.crosscorrelation import AutoCorrelation, CrossCorrelation
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import correlation, fixtures
+
+test_arr_size = [10**i for i in range(3, 7)]
+corr_maxlag = [10, 100, 1000]
+
+
+class Init:
+    """
+    Time and Memory benchmarks for the cross correlation of two lightcurves.
+    """
+    params = test_arr_size
+    param_names = ['array_size']
+    timeout = 120.0
+
+    def setup(self, array_size):
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
+
+    def time_cross(self, array_size):
+        CrossCorrelation(self.lc1, self.lc2)
+
+    def peakmem_cross(self, array_size):
+        CrossCorrelation(self.lc1, self.lc2)
+
+    def time_auto(self, array_size):
+        AutoCorrelation(self.lc1)
+
+    def peakmem_auto(self, array_size):
+        AutoCorrelation(self.lc1)
+
+    def teardown(self, array_size):
+        del self.lc1, self.lc2
+
+
+class LagRange:
+    """
+    Time and Memory benchmarks for the cross correlation of two lightcurves
+    up to a maximum lag, computed directly and with FFTs.
+    """
+    params = [test_arr_size, corr_maxlag, list(correlation.METHODS)]
+    param_names = ['array_size', 'maxlag', 'method']
+    timeout = 300.0
+
+    def setup(self, array_size, maxlag, method):
+        if maxlag >= array_size:
+            raise NotImplementedError("maxlag too long for the lightcurve")
+        self.counts1 = fixtures.white_noise(array_size)
+        self.counts2 = fixtures.white_noise(array_size,
+                                            seed=fixtures.DEFAULT_SEED + 1)
+
+    def time_corr(self, array_size, maxlag, method):
+        correlation.cross_correlation(self.counts1, self.counts2, maxlag,
+                                      method=method)
+
+    def peakmem_corr(self, array_size, maxlag, method):
+        correlation.cross_correlation(self.counts1, self.counts2, maxlag,
+                                      method=method)
+
+    def teardown(self, array_size, maxlag, method):
+        del self.counts1, self.counts2
+
+
+class Crossover:
+    """
+    Track the smallest maximum lag (a power of two) above which the FFT
+    cross correlation beats the direct one on this machine.
+    """
+    params = test_arr_size
+    param_names = ['array_size']
+    timeout = 300.0
+
+    def track_crossover_maxlag(self, array_size):
+        return correlation.crossover_maxlag(array_size)
+
+    track_crossover_maxlag.unit = 'bins'
@@ -1,13 +1,16 @@
-import numpy as np
-
 try:
-    from stingray import Lightcurve, Crossspectrum
+    from stingray import Crossspectrum
 except ImportError:
     import sys
     print("Install stingray first")
     sys.exit()
 
+from . import fixtures, memo
+
 test_arr_size = [10**i for i in range(3, 7)]
+# classical_significances takes tens of seconds from 1e5 bins, so it is
+# left out of the memoisation benchmarks.
+derived_products = ['coherence', 'time_lag']
 
 
 class Init:
@@ -19,14 +22,9 @@ class Init:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        self.lc2 = Lightcurve(times,
-                              counts + np.random.rand() * 10,
-                              dt=1.0,
-                              skip_checks=True)
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
 
     def time_init(self, array_size):
         Crossspectrum(self.lc1, self.lc2)
@@ -47,14 +45,9 @@ class Rebin:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        lc2 = Lightcurve(times,
-                         counts + np.random.rand() * 10,
-                         dt=1.0,
-                         skip_checks=True)
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
         self.Cspec = Crossspectrum(lc1, lc2)
         print(self.Cspec.freq)
 
@@ -83,14 +76,9 @@ class Coherence:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        lc2 = Lightcurve(times,
-                         counts + np.random.rand() * 10,
-                         dt=1.0,
-                         skip_checks=True)
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
         self.Cspec = Crossspectrum(lc1, lc2)
 
     def time_coher(self, array_size):
@@ -112,14 +100,9 @@ class TimeLag:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        lc2 = Lightcurve(times,
-                         counts + np.random.rand() * 10,
-                         dt=1.0,
-                         skip_checks=True)
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
         self.Cspec = Crossspectrum(lc1, lc2)
 
     def time_Tlag(self, array_size):
@@ -141,14 +124,9 @@ class ClassicalSignificances:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        lc2 = Lightcurve(times,
-                         counts + np.random.rand() * 10,
-                         dt=1.0,
-                         skip_checks=True)
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
         self.Cspec = Crossspectrum(lc1, lc2, norm='leahy')
 
     def time_classSign(self, array_size):
@@ -159,3 +137,53 @@ class ClassicalSignificances:
 
     def teardown(self, array_size):
         del self.Cspec
+
+
+class _DerivedProduct:
+    """
+    Base class for benchmarks of derived products of a cross spectra,
+    memoised with ``memo.derived``.
+    """
+    params = [test_arr_size, derived_products]
+    param_names = ['array_size', 'product']
+    timeout = 120.0
+
+    def setup(self, array_size, product):
+        lc1 = fixtures.lightcurve(array_size)
+        lc2 = fixtures.lightcurve(array_size,
+                                  seed=fixtures.DEFAULT_SEED + 1)
+        self.Cspec = Crossspectrum(lc1, lc2)
+
+    def teardown(self, array_size, product):
+        del self.Cspec
+
+
+class DerivedFirstCall(_DerivedProduct):
+    """
+    Time and Memory benchmarks for the first, computing call of a memoised
+    derived product of a cross spectra.
+    """
+    # The result is cached on the spectrum: start from a fresh one.
+    number = 1
+
+    def time_first(self, array_size, product):
+        memo.derived(self.Cspec, product)
+
+    def peakmem_first(self, array_size, product):
+        memo.derived(self.Cspec, product)
+
+
+class DerivedRepeatedCall(_DerivedProduct):
+    """
+    Time and Memory benchmarks for repeated, cached calls of a memoised
+    derived product of a cross spectra.
+    """
+    def setup(self, array_size, product):
+        super().setup(array_size, product)
+        memo.derived(self.Cspec, product)
+
+    def time_repeated(self, array_size, product):
+        memo.derived(self.Cspec, product)
+
+    def peakmem_repeated(self, array_size, product):
+        memo.derived(self.Cspec, product)
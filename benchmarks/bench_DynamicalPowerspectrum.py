@@ -0,0 +1,134 @@
+try:
+    from stingray import DynamicalPowerspectrum
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import fixtures, spectral
+
+test_arr_size = [10**i for i in range(3, 7)]
+dyn_segment_size = [100, 1000, 10000]
+
+# Overlapping windows make the dynamic power array grow as
+# array_size * segment_size / (2 * step), so these stay smaller.
+sliding_arr_size = [10**i for i in range(3, 6)]
+sliding_segment_size = [128, 1024]
+sliding_step = [1, 16, 128]
+
+
+class _DynamicalBenchmark:
+    params = [test_arr_size, dyn_segment_size]
+    param_names = ['array_size', 'segment_size']
+    timeout = 120.0
+
+    def setup(self, array_size, segment_size):
+        if segment_size > array_size:
+            raise NotImplementedError("segment longer than the lightcurve")
+        self.lc = fixtures.lightcurve(array_size)
+
+    def teardown(self, array_size, segment_size):
+        del self.lc
+
+
+class Init(_DynamicalBenchmark):
+    """
+    Time and Memory benchmarks for initializing a dynamical power spectra.
+    """
+
+    def time_init(self, array_size, segment_size):
+        DynamicalPowerspectrum(self.lc, segment_size=segment_size)
+
+    def peakmem_init(self, array_size, segment_size):
+        DynamicalPowerspectrum(self.lc, segment_size=segment_size)
+
+    def track_dyn_ps_bytes(self, array_size, segment_size):
+        dps = DynamicalPowerspectrum(self.lc, segment_size=segment_size)
+        return dps.dyn_ps.nbytes
+
+    track_dyn_ps_bytes.unit = 'bytes'
+
+
+class _Rebin(_DynamicalBenchmark):
+    def setup(self, array_size, segment_size):
+        if 4 * segment_size > array_size:
+            raise NotImplementedError("too few segments to rebin")
+        _DynamicalBenchmark.setup(self, array_size, segment_size)
+        self.dps = DynamicalPowerspectrum(self.lc, segment_size=segment_size)
+
+    def teardown(self, array_size, segment_size):
+        del self.lc, self.dps
+
+
+class RebinTime(_Rebin):
+    """
+    Time and Memory benchmarks for rebinning a dynamical power spectra in
+    time.
+    """
+
+    def time_rebin_time(self, array_size, segment_size):
+        self.dps.rebin_time(4 * self.dps.dt)
+
+    def peakmem_rebin_time(self, array_size, segment_size):
+        self.dps.rebin_time(4 * self.dps.dt)
+
+
+class RebinFrequency(_Rebin):
+    """
+    Time and Memory benchmarks for rebinning a dynamical power spectra in
+    frequency.
+    """
+
+    def time_rebin_frequency(self, array_size, segment_size):
+        self.dps.rebin_frequency(4 * self.dps.df)
+
+    def peakmem_rebin_frequency(self, array_size, segment_size):
+        self.dps.rebin_frequency(4 * self.dps.df)
+
+
+class TraceMaximum(_Rebin):
+    """
+    Time and Memory benchmarks for tracing the maximum power of a dynamical
+    power spectra.
+    """
+
+    def time_trace_maximum(self, array_size, segment_size):
+        self.dps.trace_maximum()
+
+    def peakmem_trace_maximum(self, array_size, segment_size):
+        self.dps.trace_maximum()
+
+
+class Sliding:
+    """
+    Time and Memory benchmarks for dynamical power spectra of overlapping
+    windows, transforming every window or sliding the Fourier amplitudes
+    from one window to the next.
+    """
+    params = [sliding_arr_size, sliding_segment_size, sliding_step,
+              ['fft', 'sliding']]
+    param_names = ['array_size', 'segment_size', 'step', 'method']
+    timeout = 300.0
+
+    def setup(self, array_size, segment_size, step, method):
+        if segment_size > array_size:
+            raise NotImplementedError("segment longer than the lightcurve")
+        self.counts = fixtures.white_noise(array_size)
+
+    def dyn_ps(self, segment_size, step, method):
+        return spectral.dynamical_powerspectrum(
+            self.counts, segment_size, step=step, method=method)[2]
+
+    def time_sliding(self, array_size, segment_size, step, method):
+        self.dyn_ps(segment_size, step, method)
+
+    def peakmem_sliding(self, array_size, segment_size, step, method):
+        self.dyn_ps(segment_size, step, method)
+
+    def track_dyn_ps_bytes(self, array_size, segment_size, step, method):
+        return self.dyn_ps(segment_size, step, method).nbytes
+
+    track_dyn_ps_bytes.unit = 'bytes'
+
+    def teardown(self, array_size, segment_size, step, method):
+        del self.counts
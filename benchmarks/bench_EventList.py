@@ -0,0 +1,167 @@
+try:
+    from stingray import EventList, Lightcurve
+    from stingray.gti import create_gti_mask
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import events, fixtures
+
+# Photons arrive at 1000 counts/s and are binned at 1 s.
+event_counts = [10**i for i in range(3, 8)]
+event_dt = 1e-3
+bin_dt = 1.0
+
+
+class Init:
+    """
+    Time and Memory benchmarks for initializing an event list.
+    """
+    params = event_counts
+    param_names = ['n_events']
+    timeout = 120.0
+
+    def setup(self, n_events):
+        self.times = fixtures.poisson_events(n_events, dt=event_dt)
+        self.energies = fixtures.event_energies(n_events)
+
+    def time_init(self, n_events):
+        EventList(time=self.times, energy=self.energies)
+
+    def peakmem_init(self, n_events):
+        EventList(time=self.times, energy=self.energies)
+
+    def teardown(self, n_events):
+        del self.times, self.energies
+
+
+class ToLightcurve:
+    """
+    Time and Memory benchmarks for binning an event list into a lightcurve.
+    """
+    params = event_counts
+    param_names = ['n_events']
+    timeout = 120.0
+
+    def setup(self, n_events):
+        self.ev = EventList(time=fixtures.poisson_events(n_events,
+                                                         dt=event_dt))
+
+    def time_to_lc(self, n_events):
+        self.ev.to_lc(bin_dt)
+
+    def peakmem_to_lc(self, n_events):
+        self.ev.to_lc(bin_dt)
+
+    def teardown(self, n_events):
+        del self.ev
+
+
+class BinEvents:
+    """
+    Time and Memory benchmarks for binning sorted and unsorted arrival times
+    with Lightcurve.make_lightcurve and with the bulk bincount path.
+    """
+    params = [event_counts, ['sorted', 'unsorted']]
+    param_names = ['n_events', 'order']
+    timeout = 120.0
+
+    def setup(self, n_events, order):
+        if order == 'sorted':
+            self.times = fixtures.poisson_events(n_events, dt=event_dt)
+        else:
+            self.times = fixtures.shuffled_events(n_events, dt=event_dt)
+        self.tstart = float(self.times.min())
+        self.tseg = float(self.times.max()) - self.tstart
+        self.presorted = order == 'sorted'
+
+    def time_make_lightcurve(self, n_events, order):
+        Lightcurve.make_lightcurve(self.times, bin_dt, tstart=self.tstart,
+                                   tseg=self.tseg)
+
+    def peakmem_make_lightcurve(self, n_events, order):
+        Lightcurve.make_lightcurve(self.times, bin_dt, tstart=self.tstart,
+                                   tseg=self.tseg)
+
+    def time_bincount(self, n_events, order):
+        events.to_lightcurve(self.times, bin_dt, tstart=self.tstart,
+                             tseg=self.tseg, presorted=self.presorted)
+
+    def peakmem_bincount(self, n_events, order):
+        events.to_lightcurve(self.times, bin_dt, tstart=self.tstart,
+                             tseg=self.tseg, presorted=self.presorted)
+
+    def teardown(self, n_events, order):
+        del self.times
+
+
+class Sort:
+    """
+    Time and Memory benchmarks for sorting an event list of shuffled photons.
+    """
+    params = event_counts
+    param_names = ['n_events']
+    timeout = 120.0
+
+    def setup(self, n_events):
+        if not hasattr(EventList, 'sort'):
+            raise NotImplementedError("EventList.sort not available")
+        self.ev = EventList(time=fixtures.shuffled_events(n_events,
+                                                          dt=event_dt),
+                            energy=fixtures.event_energies(n_events))
+
+    def time_sort(self, n_events):
+        self.ev.sort()
+
+    def peakmem_sort(self, n_events):
+        self.ev.sort()
+
+    def teardown(self, n_events):
+        del self.ev
+
+
+class Join:
+    """
+    Time and Memory benchmarks for joining two event lists.
+    """
+    params = event_counts
+    param_names = ['n_events']
+    timeout = 120.0
+
+    def setup(self, n_events):
+        self.ev1 = EventList(time=fixtures.poisson_events(n_events,
+                                                          dt=event_dt))
+        self.ev2 = EventList(time=fixtures.poisson_events(
+            n_events, seed=fixtures.DEFAULT_SEED + 1, dt=event_dt))
+
+    def time_join(self, n_events):
+        self.ev1.join(self.ev2)
+
+    def peakmem_join(self, n_events):
+        self.ev1.join(self.ev2)
+
+    def teardown(self, n_events):
+        del self.ev1, self.ev2
+
+
+class FilterGTI:
+    """
+    Time and Memory benchmarks for filtering an event list with gapped GTIs.
+    """
+    params = event_counts
+    param_names = ['n_events']
+    timeout = 300.0
+
+    def setup(self, n_events):
+        self.times = fixtures.poisson_events(n_events, dt=event_dt)
+        self.gti = fixtures.gapped_gtis(n_events, dt=event_dt, n_gaps=10)
+
+    def time_filter(self, n_events):
+        self.times[create_gti_mask(self.times, self.gti)]
+
+    def peakmem_filter(self, n_events):
+        self.times[create_gti_mask(self.times, self.gti)]
+
+    def teardown(self, n_events):
+        del self.times, self.gti
@@ -0,0 +1,131 @@
+"""
+Spectral benchmarks for every FFT backend installed locally, with and
+without plan caching where the backend supports it.
+
+Stingray picks its FFT internally, so these run the ``spectral`` kernels,
+which follow stingray's conventions, with each backend plugged in. The
+``track_*_seconds`` metrics split one run into time spent inside the FFTs
+and the Python overhead around them.
+"""
+import time
+
+from . import fft_backends, fixtures, spectral
+
+test_arr_size = [10**i for i in range(3, 7)]
+backend_names = list(fft_backends.BACKENDS)
+plan_modes = ['unplanned', 'planned']
+
+
+class _BackendBenchmark:
+    params = [test_arr_size, backend_names, plan_modes]
+    param_names = ['array_size', 'backend', 'plan']
+    timeout = 120.0
+    segment_size = 1000
+    cross = False
+
+    def setup(self, array_size, backend, plan):
+        try:
+            self.backend = fft_backends.get_backend(
+                backend, planned=plan == 'planned')
+        except (ImportError, ValueError):
+            raise NotImplementedError("{} {} not available".format(
+                plan, backend))
+        self.counts1 = fixtures.white_noise(array_size)
+        self.counts2 = fixtures.white_noise(array_size,
+                                            seed=fixtures.DEFAULT_SEED + 1)
+        # Build the plans outside of the timed region.
+        self.spectrum(array_size, self.backend)
+
+    def spectrum(self, array_size, fft):
+        # Segments are added one by one, so planned backends reuse a single
+        # plan across all of them.
+        segment_size = min(self.segment_size or array_size, array_size)
+        averager = spectral.SegmentAverager(segment_size, cross=self.cross,
+                                            fft=fft)
+        for start in range(0, array_size - segment_size + 1, segment_size):
+            segment = slice(start, start + segment_size)
+            averager.add(self.counts1[segment], self.counts2[segment])
+        return averager.result()
+
+    def teardown(self, array_size, backend, plan):
+        del self.backend, self.counts1, self.counts2
+
+
+class _Init(_BackendBenchmark):
+    def time_init(self, array_size, backend, plan):
+        self.spectrum(array_size, self.backend)
+
+    def peakmem_init(self, array_size, backend, plan):
+        self.spectrum(array_size, self.backend)
+
+    def track_fft_seconds(self, array_size, backend, plan):
+        timed = fft_backends.TimedBackend(self.backend)
+        self.spectrum(array_size, timed)
+        return timed.fft_time
+
+    track_fft_seconds.unit = 'seconds'
+
+    def track_overhead_seconds(self, array_size, backend, plan):
+        timed = fft_backends.TimedBackend(self.backend)
+        start = time.perf_counter()
+        self.spectrum(array_size, timed)
+        return time.perf_counter() - start - timed.fft_time
+
+    track_overhead_seconds.unit = 'seconds'
+
+
+class PowerspectrumInit(_Init):
+    """
+    Time and Memory benchmarks for a power spectra of the whole lightcurve.
+    """
+    segment_size = None
+
+
+class CrossspectrumInit(_Init):
+    """
+    Time and Memory benchmarks for a cross spectra of the whole lightcurves.
+    """
+    segment_size = None
+    cross = True
+
+
+class AvgPowerspectrumInit(_Init):
+    """
+    Time and Memory benchmarks for an averaged power spectra.
+    """
+
+
+class AvgCrossspectrumInit(_Init):
+    """
+    Time and Memory benchmarks for an averaged cross spectra.
+    """
+    cross = True
+
+
+class Coherence(_BackendBenchmark):
+    """
+    Time and Memory benchmarks for the coherence of an averaged cross
+    spectra, including the cross spectra itself: the coherence alone runs
+    no FFT, so it would time the same code for every backend.
+    """
+    cross = True
+
+    def time_coher(self, array_size, backend, plan):
+        self.spectrum(array_size, self.backend).coherence()
+
+    def peakmem_coher(self, array_size, backend, plan):
+        self.spectrum(array_size, self.backend).coherence()
+
+
+class TimeLag(_BackendBenchmark):
+    """
+    Time and Memory benchmarks for the time lag of an averaged cross
+    spectra, including the cross spectra itself.
+    """
+    cross = True
+
+    def time_Tlag(self, array_size, backend, plan):
+        self.spectrum(array_size, self.backend).time_lag()
+
+    def peakmem_Tlag(self, array_size, backend, plan):
+        self.spectrum(array_size, self.backend).time_lag()
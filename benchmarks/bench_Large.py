@@ -0,0 +1,113 @@
+"""
+Out-of-core tier: light curves of 10^8 and 10^9 bins built on memory-mapped
+times and counts.
+
+These benchmarks need tens of gigabytes of disk for the cached inputs and
+run for a long time, so they are skipped unless ``STINGRAY_BENCH_LARGE`` is
+set in the environment. Besides wall time and peak memory they track the
+peak of the memory each step allocates on top of the mapped inputs, in
+bytes and in multiples of one input array. The peak is traced with
+``tracemalloc``, so whole-array temporaries freed before the step returns
+count too: code paths that stream over the maps stay near zero, code paths
+that materialise whole arrays do not.
+"""
+import os
+
+try:
+    from stingray import Lightcurve, AveragedPowerspectrum, \
+        AveragedCrossspectrum
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import allocations, fixtures
+
+large_arr_size = [10**8, 10**9]
+segment_size = 1000
+
+
+def _require_large_tier():
+    if not os.environ.get('STINGRAY_BENCH_LARGE'):
+        raise NotImplementedError("set STINGRAY_BENCH_LARGE to run")
+
+
+class _LargeBenchmark:
+    params = large_arr_size
+    param_names = ['array_size']
+    timeout = 3600.0
+    processes = 1
+    repeat = 1
+    number = 1
+    warmup_time = 0
+
+    def build(self, array_size):
+        raise NotImplementedError
+
+    def time_init(self, array_size):
+        self.build(array_size)
+
+    def peakmem_init(self, array_size):
+        self.build(array_size)
+
+    def track_peak_bytes(self, array_size):
+        return allocations.measure(self.build, array_size).peak_bytes
+
+    track_peak_bytes.unit = 'bytes'
+
+    def track_peak_copies(self, array_size):
+        return allocations.measure(self.build, array_size).copies(
+            array_size * 8)
+
+    track_peak_copies.unit = 'copies'
+
+
+class LightcurveInit(_LargeBenchmark):
+    """
+    Time and Memory benchmarks for initializing a memory-mapped lightcurve.
+    """
+    def setup(self, array_size):
+        _require_large_tier()
+        self.times = fixtures.times(array_size)
+        self.counts = fixtures.white_noise(array_size)
+
+    def build(self, array_size):
+        return Lightcurve(self.times, self.counts, dt=1.0, skip_checks=True)
+
+    def teardown(self, array_size):
+        del self.times, self.counts
+
+
+class AvgPowerspectrum(_LargeBenchmark):
+    """
+    Time and Memory benchmarks for an averaged power spectrum of a
+    memory-mapped lightcurve.
+    """
+    def setup(self, array_size):
+        _require_large_tier()
+        self.lc = fixtures.lightcurve(array_size)
+
+    def build(self, array_size):
+        return AveragedPowerspectrum(self.lc, segment_size)
+
+    def teardown(self, array_size):
+        del self.lc
+
+
+class AvgCrossspectrum(_LargeBenchmark):
+    """
+    Time and Memory benchmarks for an averaged cross spectrum of two
+    memory-mapped lightcurves.
+    """
+    def setup(self, array_size):
+        _require_large_tier()
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
+
+    def build(self, array_size):
+        return AveragedCrossspectrum(self.lc1, self.lc2, segment_size,
+                                     silent=True)
+
+    def teardown(self, array_size):
+        del self.lc1, self.lc2
@@ -1,13 +1,24 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
 try:
     from stingray import Lightcurve
+    from stingray.gti import create_gti_mask
 except ImportError:
     import sys
     print("Install stingray first")
     sys.exit()
 
+from . import allocations, binindex, chunks, deferred, fixtures, gtis, \
+    inplace, join, sorting, views
+
 test_arr_size = [10**i for i in range(3, 7)]
+rebin_factors = list(range(2, 22))
+gti_intervals = [1, 100, 10**4, 10**5]
+lazy_attributes = ['dt', 'gti', 'counts_err', 'countrate']
+chunk_sizes = [100, 1000, 10**4]
+join_parts = [2, 100, 10**4]
 
 
 class Init:
@@ -20,8 +31,8 @@ class Init:
     timeout = 120.0
 
     def setup(self, array_size):
-        self.times = np.arange(array_size)
-        self.counts = np.random.rand(array_size) * 100
+        self.times = fixtures.times(array_size)
+        self.counts = fixtures.white_noise(array_size)
 
     def time_no_param(self, array_size):
         Lightcurve(self.times, self.counts)
@@ -35,10 +46,55 @@ class Init:
     def peakmem_param(self, array_size):
         Lightcurve(self.times, self.counts, dt=1.0, skip_checks=True)
 
+    def time_deferred(self, array_size):
+        deferred.DeferredLightcurve(self.times, self.counts)
+
+    def peakmem_deferred(self, array_size):
+        deferred.DeferredLightcurve(self.times, self.counts)
+
+    def time_deferred_validated(self, array_size):
+        deferred.DeferredLightcurve(self.times, self.counts).validate()
+
+    def peakmem_deferred_validated(self, array_size):
+        deferred.DeferredLightcurve(self.times, self.counts).validate()
+
     def teardown(self, array_size):
         del self.times, self.counts
 
 
+class FirstAccess:
+    """
+    Time and Memory benchmarks for the first access to attributes that a
+    lightcurve derives from its times and counts, built with or without
+    checks or with everything deferred.
+    """
+    params = [test_arr_size, ['checked', 'unchecked', 'deferred'],
+              lazy_attributes]
+    param_names = ['array_size', 'construction', 'attribute']
+    timeout = 120.0
+    # Attributes are cached after the first access: start from a fresh one.
+    number = 1
+
+    def setup(self, array_size, construction, attribute):
+        times = fixtures.times(array_size)
+        counts = fixtures.white_noise(array_size)
+        if construction == 'checked':
+            self.lc = Lightcurve(times, counts)
+        elif construction == 'unchecked':
+            self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        else:
+            self.lc = deferred.DeferredLightcurve(times, counts)
+
+    def time_first_access(self, array_size, construction, attribute):
+        getattr(self.lc, attribute)
+
+    def peakmem_first_access(self, array_size, construction, attribute):
+        getattr(self.lc, attribute)
+
+    def teardown(self, array_size, construction, attribute):
+        del self.lc
+
+
 class ChangeMJDREF:
     """
     Time and Memory benchmarks for changing the mjdref of a lightcurve.
@@ -48,9 +104,7 @@ class ChangeMJDREF:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_MJD(self, array_size):
         self.lc.change_mjdref(-2379826)
@@ -72,9 +126,9 @@ class Rebin:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
+        self.indexed = fixtures.lightcurve(array_size)
+        binindex.rebin_index(self.indexed)
 
     def time_rebin_sum(self, array_size):
         self.lc.rebin(2.0)
@@ -88,11 +142,77 @@ class Rebin:
     def peakmem_rebin_mean_avg(self, array_size):
         self.lc.rebin(2.0, method='avg')
 
+    def time_rebin_sum_index(self, array_size):
+        binindex.rebin(self.indexed, 2.0)
+
+    def peakmem_rebin_sum_index(self, array_size):
+        binindex.rebin(self.indexed, 2.0)
+
+    def time_rebin_mean_avg_index(self, array_size):
+        binindex.rebin(self.indexed, 2.0, method='avg')
+
+    def peakmem_rebin_mean_avg_index(self, array_size):
+        binindex.rebin(self.indexed, 2.0, method='avg')
+
     def teardown(self, array_size):
         del self.lc
+        del self.indexed
 
 
-class AddLightcurve:
+class MultiResolution:
+    """
+    Time and Memory benchmarks for rebinning one lightcurve to 20
+    resolutions, with ``Lightcurve.rebin`` or through a prefix-sum index
+    built on the first rebin.
+    """
+    params = [test_arr_size, ['rebin', 'index']]
+    param_names = ['array_size', 'method']
+    timeout = 300.0
+    # The index is cached on the lightcurve: start from a fresh one.
+    number = 1
+
+    def setup(self, array_size, method):
+        self.lc = fixtures.lightcurve(array_size)
+        self.lc.counts_err
+
+    def _rebin_all(self, method):
+        if method == 'index':
+            return [binindex.rebin(self.lc, float(factor))
+                    for factor in rebin_factors]
+        return [self.lc.rebin(float(factor)) for factor in rebin_factors]
+
+    def time_rebin(self, array_size, method):
+        self._rebin_all(method)
+
+    def peakmem_rebin(self, array_size, method):
+        self._rebin_all(method)
+
+    def teardown(self, array_size, method):
+        del self.lc
+
+
+class _OperatorAllocations:
+    """
+    Base class tracking the allocations of one call to ``operation``, which
+    subclasses define.
+    """
+    def track_peak_bytes(self, array_size):
+        return allocations.measure(self.operation).peak_bytes
+
+    track_peak_bytes.unit = 'bytes'
+
+    def track_array_copies(self, array_size):
+        return allocations.measure(self.operation).copies(array_size * 8)
+
+    track_array_copies.unit = 'copies'
+
+    def track_kept_arrays(self, array_size):
+        return allocations.measure(self.operation).kept_arrays
+
+    track_kept_arrays.unit = 'arrays'
+
+
+class AddLightcurve(_OperatorAllocations):
     """
     Time and Memory benchmarks for adding two lightcurves.
     """
@@ -101,14 +221,9 @@ class AddLightcurve:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        self.lc2 = Lightcurve(times,
-                              counts * np.random.rand(array_size),
-                              dt=1.0,
-                              skip_checks=True)
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
 
     def time_bench(self, array_size):
         self.lc1.__add__(self.lc2)
@@ -116,11 +231,14 @@ class AddLightcurve:
     def peakmem_bench(self, array_size):
         self.lc1.__add__(self.lc2)
 
+    def operation(self):
+        return self.lc1.__add__(self.lc2)
+
     def teardown(self, array_size):
         del self.lc1, self.lc2
 
 
-class SubLightcurve:
+class SubLightcurve(_OperatorAllocations):
     """
     Time and Memory benchmarks for subtracting two lightcurves.
     """
@@ -129,14 +247,9 @@ class SubLightcurve:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        self.lc2 = Lightcurve(times,
-                              counts * np.random.rand(array_size),
-                              dt=1.0,
-                              skip_checks=True)
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
 
     def time_bench(self, array_size):
         self.lc1.__sub__(self.lc2)
@@ -144,11 +257,14 @@ class SubLightcurve:
     def peakmem_bench(self, array_size):
         self.lc1.__sub__(self.lc2)
 
+    def operation(self):
+        return self.lc1.__sub__(self.lc2)
+
     def teardown(self, array_size):
         del self.lc1, self.lc2
 
 
-class CheckEqLightcurve:
+class CheckEqLightcurve(_OperatorAllocations):
     """
     Time and Memory benchmarks for checking if two lightcurves are equal.
     """
@@ -157,11 +273,8 @@ class CheckEqLightcurve:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        self.lc2 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size)
 
     def time_bench(self, array_size):
         self.lc1.__eq__(self.lc2)
@@ -169,11 +282,14 @@ class CheckEqLightcurve:
     def peakmem_bench(self, array_size):
         self.lc1.__eq__(self.lc2)
 
+    def operation(self):
+        return self.lc1.__eq__(self.lc2)
+
     def teardown(self, array_size):
         del self.lc1, self.lc2
 
 
-class NegLightcurve:
+class NegLightcurve(_OperatorAllocations):
     """
     Time and Memory benchmarks for negating a lightcurves.
     """
@@ -182,10 +298,7 @@ class NegLightcurve:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_bench(self, array_size):
         self.lc.__neg__()
@@ -193,10 +306,107 @@ class NegLightcurve:
     def peakmem_bench(self, array_size):
         self.lc.__neg__()
 
+    def operation(self):
+        return self.lc.__neg__()
+
     def teardown(self, array_size):
         del self.lc
 
 
+class InplaceArithmetic:
+    """
+    Time and Memory benchmarks for adding and subtracting lightcurves in
+    place.
+    """
+    params = test_arr_size
+    param_names = ['array_size']
+    timeout = 120.0
+
+    def setup(self, array_size):
+        # The first lightcurve is written to, so it needs its own arrays.
+        self.lc1 = Lightcurve(np.array(fixtures.times(array_size)),
+                              np.array(fixtures.white_noise(array_size)),
+                              dt=1.0, skip_checks=True)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
+        self.lc2.time = self.lc1.time
+        # Compute the default Poisson errors now rather than in the first
+        # timed call.
+        self.lc1.counts_err, self.lc2.counts_err
+
+    def time_iadd(self, array_size):
+        inplace.iadd(self.lc1, self.lc2)
+
+    def peakmem_iadd(self, array_size):
+        inplace.iadd(self.lc1, self.lc2)
+
+    def track_iadd_peak_bytes(self, array_size):
+        return allocations.measure(inplace.iadd, self.lc1,
+                                   self.lc2).peak_bytes
+
+    track_iadd_peak_bytes.unit = 'bytes'
+
+    def time_isub(self, array_size):
+        inplace.isub(self.lc1, self.lc2)
+
+    def peakmem_isub(self, array_size):
+        inplace.isub(self.lc1, self.lc2)
+
+    def track_isub_peak_bytes(self, array_size):
+        return allocations.measure(inplace.isub, self.lc1,
+                                   self.lc2).peak_bytes
+
+    track_isub_peak_bytes.unit = 'bytes'
+
+    def teardown(self, array_size):
+        del self.lc1, self.lc2
+
+
+class SumLightcurves:
+    """
+    Time and Memory benchmarks for summing many lightcurves, with a new
+    lightcurve per addition or accumulating in place.
+    """
+    params = [[10, 100, 1000], ['add', 'inplace']]
+    param_names = ['n_lightcurves', 'method']
+    timeout = 300.0
+    array_size = 10**4
+
+    def setup(self, n_lightcurves, method):
+        times = np.array(fixtures.times(self.array_size))
+        self.lcs = [Lightcurve(times, fixtures.white_noise(
+            self.array_size, seed=fixtures.DEFAULT_SEED + i), dt=1.0,
+            skip_checks=True) for i in range(n_lightcurves)]
+        for lc in self.lcs:
+            lc.counts_err
+
+    def total(self, method):
+        first = self.lcs[0]
+        total = Lightcurve(first.time, np.array(first.counts),
+                           err=np.array(first.counts_err), dt=1.0,
+                           skip_checks=True)
+        for lc in self.lcs[1:]:
+            if method == 'add':
+                total = total + lc
+            else:
+                total = inplace.iadd(total, lc)
+        return total
+
+    def time_sum(self, n_lightcurves, method):
+        self.total(method)
+
+    def peakmem_sum(self, n_lightcurves, method):
+        self.total(method)
+
+    def track_peak_bytes(self, n_lightcurves, method):
+        return allocations.measure(self.total, method).peak_bytes
+
+    track_peak_bytes.unit = 'bytes'
+
+    def teardown(self, n_lightcurves, method):
+        del self.lcs
+
+
 class Truncate:
     """
     Time and Memory benchmarks for truncating a lightcurve.
@@ -207,9 +417,7 @@ class Truncate:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_trunc_index(self, array_size):
         self.lc.truncate(0, 1000)
@@ -223,6 +431,12 @@ class Truncate:
     def peakmem_trunc_time(self, array_size):
         self.lc.truncate(0, array_size / 2, method='time')
 
+    def time_trunc_time_view(self, array_size):
+        binindex.truncate(self.lc, 0, array_size / 2, method='time')
+
+    def peakmem_trunc_time_view(self, array_size):
+        binindex.truncate(self.lc, 0, array_size / 2, method='time')
+
     def teardown(self, array_size):
         del self.lc
 
@@ -236,14 +450,9 @@ class Join:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc1 = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-        self.lc2 = Lightcurve(times,
-                              counts * np.random.rand(array_size),
-                              dt=1.0,
-                              skip_checks=True)
+        self.lc1 = fixtures.lightcurve(array_size)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1)
 
     def time_bench(self, array_size):
         self.lc1.join(self.lc2)
@@ -255,17 +464,67 @@ class Join:
         del self.lc1, self.lc2
 
 
+class JoinMany:
+    """
+    Time and Memory benchmarks for joining a lightcurve split in consecutive
+    parts, with a left fold of ``join`` or with ``join_many``.
+    """
+    params = [test_arr_size, join_parts, ['fold', 'join_many']]
+    param_names = ['array_size', 'n_parts', 'method']
+    # The fold copies all the joined bins at every step.
+    timeout = 600.0
+
+    def setup(self, array_size, n_parts, method):
+        if array_size < 10 * n_parts:
+            raise NotImplementedError("Parts shorter than 10 bins")
+        if method == 'fold' and array_size * n_parts > 10**9:
+            raise NotImplementedError("Too slow to fold")
+        lc = fixtures.lightcurve(array_size)
+        lc.counts_err
+        edges = np.linspace(0, array_size, n_parts + 1).astype(int)
+        self.parts = [lc[start:stop]
+                      for start, stop in zip(edges[:-1], edges[1:])]
+
+    def _join(self, method):
+        if method == 'join_many':
+            return join.join_many(self.parts)
+        joined = self.parts[0]
+        for part in self.parts[1:]:
+            joined = joined.join(part)
+        return joined
+
+    def time_join(self, array_size, n_parts, method):
+        self._join(method)
+
+    def peakmem_join(self, array_size, n_parts, method):
+        self._join(method)
+
+    def teardown(self, array_size, n_parts, method):
+        del self.parts
+
+
+def _split_and_read(split, *args):
+    """Split with ``split(*args)`` and only read the counts of the pieces."""
+    pieces = split(*args)
+    for piece in pieces:
+        np.sum(piece.counts)
+    return pieces
+
+
 class Split:
     """
-    Time and Memory benchmarks for splitting a lightcurves.
+    Time and Memory benchmarks for splitting a lightcurves, into copies or
+    into views of its arrays, at gaps that cut it into ``n_pieces``.
     """
     params = test_arr_size
     param_names = ['array_size']
     timeout = 120.0
+    n_pieces = 100
 
     def setup(self, array_size):
-        times = np.arange(0, array_size, np.random.randint(4, 9))
-        counts = np.random.rand(len(times)) * 100
+        gaps = np.arange(array_size) // (array_size // self.n_pieces)
+        times = fixtures.times(array_size) + 10.0 * gaps
+        counts = fixtures.white_noise(array_size)
 
         self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
 
@@ -275,6 +534,24 @@ class Split:
     def peakmem_bench(self, array_size):
         self.lc.split(4)
 
+    def time_views(self, array_size):
+        views.split(self.lc, 4)
+
+    def peakmem_views(self, array_size):
+        views.split(self.lc, 4)
+
+    def track_peak_bytes(self, array_size):
+        return allocations.measure(_split_and_read, self.lc.split,
+                                   4).peak_bytes
+
+    track_peak_bytes.unit = 'bytes'
+
+    def track_peak_bytes_views(self, array_size):
+        return allocations.measure(_split_and_read, views.split, self.lc,
+                                   4).peak_bytes
+
+    track_peak_bytes_views.unit = 'bytes'
+
     def teardown(self, array_size):
         del self.lc
 
@@ -288,7 +565,7 @@ class MakeLightcurve:
     timeout = 120.0
 
     def setup(self, array_size):
-        self.times = np.arange(array_size)
+        self.times = fixtures.times(array_size)
 
     def time_bench(self, array_size):
         Lightcurve.make_lightcurve(self.times, dt=1.0)
@@ -297,7 +574,7 @@ class MakeLightcurve:
         Lightcurve.make_lightcurve(self.times, dt=1.0)
 
     def teardown(self, array_size):
-        del self.lc
+        del self.times
 
 
 class Sort:
@@ -310,8 +587,9 @@ class Sort:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.random.rand(array_size) * 10
-        counts = np.random.rand(array_size) * 100
+        times = fixtures.white_noise(array_size,
+                                     seed=fixtures.DEFAULT_SEED + 2) / 10
+        counts = fixtures.white_noise(array_size)
         self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
 
     def time_sort_times(self, array_size):
@@ -330,6 +608,44 @@ class Sort:
         del self.lc
 
 
+class SortOrdered:
+    """
+    Time and Memory benchmarks for sorting sorted, nearly sorted and random
+    lightcurves, with ``sort`` or skipping the work on ordered data.
+    """
+    params = [test_arr_size, ['sorted', 'nearly_sorted', 'random'],
+              ['stingray', 'presorted']]
+    param_names = ['array_size', 'order', 'method']
+    timeout = 120.0
+
+    def setup(self, array_size, order, method):
+        if order == 'sorted':
+            times = fixtures.times(array_size)
+        elif order == 'nearly_sorted':
+            times = fixtures.nearly_sorted_times(array_size)
+        else:
+            times = fixtures.white_noise(array_size,
+                                         seed=fixtures.DEFAULT_SEED + 2) / 10
+        counts = fixtures.white_noise(array_size)
+        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc.counts_err
+
+    def time_sort_times(self, array_size, order, method):
+        if method == 'presorted':
+            sorting.sort(self.lc)
+        else:
+            self.lc.sort()
+
+    def peakmem_sort_times(self, array_size, order, method):
+        if method == 'presorted':
+            sorting.sort(self.lc)
+        else:
+            self.lc.sort()
+
+    def teardown(self, array_size, order, method):
+        del self.lc
+
+
 class AnalyzeChunks:
     """
     Time and Memory benchmarks for analyzing lightcurve chunks.
@@ -339,10 +655,7 @@ class AnalyzeChunks:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_bench(self, array_size):
         self.lc.analyze_lc_chunks(1000, lambda x: np.mean(x))
@@ -354,6 +667,57 @@ class AnalyzeChunks:
         del self.lc
 
 
+def _mean_counts(lc):
+    # Module level, so that worker processes can unpickle it.
+    return np.mean(lc.counts)
+
+
+class AnalyzeChunksModes:
+    """
+    Time and Memory benchmarks for the mean of every chunk of a lightcurve,
+    with a callback per chunk in ``analyze_segments``, a process pool or a
+    generator, or with one vectorised reduction.
+    """
+    params = [test_arr_size, chunk_sizes,
+              ['stingray', 'reduceat', 'process', 'generator']]
+    param_names = ['array_size', 'chunk_size', 'mode']
+    timeout = 300.0
+
+    n_workers = 4
+
+    def setup(self, array_size, chunk_size, mode):
+        if chunk_size > array_size:
+            raise NotImplementedError("Chunks longer than the lightcurve")
+        self.lc = fixtures.lightcurve(array_size)
+        self.pool = None
+        if mode == 'process':
+            self.pool = ProcessPoolExecutor(self.n_workers)
+            # Start the workers outside of the timed region.
+            self._analyze(chunk_size, mode)
+
+    def _analyze(self, chunk_size, mode):
+        if mode == 'stingray':
+            return self.lc.analyze_segments(_mean_counts, chunk_size)
+        if mode == 'reduceat':
+            return chunks.reduce_segments(self.lc, chunk_size, 'mean')
+        if mode == 'process':
+            return chunks.map_segments(self.lc, chunk_size, _mean_counts,
+                                       n_workers=self.n_workers,
+                                       executor=self.pool)
+        return list(chunks.iter_segments(self.lc, chunk_size, _mean_counts))
+
+    def time_analyze(self, array_size, chunk_size, mode):
+        self._analyze(chunk_size, mode)
+
+    def peakmem_analyze(self, array_size, chunk_size, mode):
+        self._analyze(chunk_size, mode)
+
+    def teardown(self, array_size, chunk_size, mode):
+        if self.pool is not None:
+            self.pool.shutdown()
+        del self.lc, self.pool
+
+
 class EstimateChunkLength:
     """
     Time and Memory benchmarks for estimating lightcurve chunk length.
@@ -363,10 +727,7 @@ class EstimateChunkLength:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_bench(self, array_size):
         self.lc.estimate_chunk_length(100, 100)
@@ -378,52 +739,127 @@ class EstimateChunkLength:
         del self.lc
 
 
-class SplitGTI:
+class _FragmentedGTIBenchmark:
+    params = [test_arr_size, gti_intervals, list(fixtures.GTI_PATTERNS)]
+    param_names = ['array_size', 'n_intervals', 'pattern']
+    # The per-GTI loops scale as bins times intervals, so the stingray
+    # methods are expected to time out on the most fragmented cases.
+    timeout = 300.0
+
+    def setup(self, array_size, n_intervals, pattern):
+        try:
+            gti = fixtures.fragmented_gtis(array_size, n_intervals, pattern)
+        except ValueError:
+            raise NotImplementedError("too many GTIs for the lightcurve")
+        self.lc = fixtures.lightcurve(array_size, gti=np.array(gti))
+
+    def teardown(self, array_size, n_intervals, pattern):
+        del self.lc
+
+
+class SplitGTI(_FragmentedGTIBenchmark):
     """
     Time and Memory benchmarks for splitting lightcurve object according to GTI's.
+    Compares Lightcurve.split_by_gti with a single searchsorted pass, and
+    with read-only views of the lightcurve arrays.
     """
-    params = test_arr_size
-    param_names = ['array_size']
-    timeout = 120.0
 
-    def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-
-    def time_bench(self, array_size):
+    def time_bench(self, array_size, n_intervals, pattern):
         self.lc.split_by_gti()
 
-    def peakmem_bench(self, array_size):
+    def peakmem_bench(self, array_size, n_intervals, pattern):
         self.lc.split_by_gti()
 
-    def teardown(self, array_size):
-        del self.lc
+    def time_searchsorted(self, array_size, n_intervals, pattern):
+        gtis.split_by_gti(self.lc)
+
+    def peakmem_searchsorted(self, array_size, n_intervals, pattern):
+        gtis.split_by_gti(self.lc)
+
+    def time_views(self, array_size, n_intervals, pattern):
+        views.split_by_gti(self.lc)
+
+    def peakmem_views(self, array_size, n_intervals, pattern):
+        views.split_by_gti(self.lc)
+
+    def track_peak_bytes(self, array_size, n_intervals, pattern):
+        return allocations.measure(_split_and_read,
+                                   self.lc.split_by_gti).peak_bytes
 
+    track_peak_bytes.unit = 'bytes'
 
-class ApplyGTI:
+    def track_peak_bytes_views(self, array_size, n_intervals, pattern):
+        return allocations.measure(_split_and_read, views.split_by_gti,
+                                   self.lc).peak_bytes
+
+    track_peak_bytes_views.unit = 'bytes'
+
+
+class ApplyGTI(_FragmentedGTIBenchmark):
     """
     Time and Memory benchmarks to apply GTI to lightcurve.
+    Compares Lightcurve.apply_gtis with the interval-index mask.
     """
-    params = test_arr_size
-    param_names = ['array_size']
-    timeout = 120.0
+    # apply_gtis works in place, so every sample needs a fresh lightcurve.
+    number = 1
 
-    def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
-
-    def time_bench(self, array_size):
+    def time_bench(self, array_size, n_intervals, pattern):
         self.lc.apply_gtis()
 
-    def peakmem_bench(self, array_size):
+    def peakmem_bench(self, array_size, n_intervals, pattern):
         self.lc.apply_gtis()
 
-    def teardown(self, array_size):
-        del self.lc
+    def time_searchsorted(self, array_size, n_intervals, pattern):
+        gtis.apply_gtis(self.lc)
+
+    def peakmem_searchsorted(self, array_size, n_intervals, pattern):
+        gtis.apply_gtis(self.lc)
+
+
+class TruncateGTI(_FragmentedGTIBenchmark):
+    """
+    Time and Memory benchmarks for truncating a lightcurve with fragmented
+    GTI's.
+    """
+
+    def time_trunc_time(self, array_size, n_intervals, pattern):
+        self.lc.truncate(0, array_size / 2, method='time')
+
+    def peakmem_trunc_time(self, array_size, n_intervals, pattern):
+        self.lc.truncate(0, array_size / 2, method='time')
+
+
+class GTIMask:
+    """
+    Time and Memory benchmarks for building the good bin mask of fragmented
+    GTI's, with create_gti_mask and with the interval-index mask.
+    """
+    params = [test_arr_size, gti_intervals, list(fixtures.GTI_PATTERNS)]
+    param_names = ['array_size', 'n_intervals', 'pattern']
+    timeout = 300.0
+
+    def setup(self, array_size, n_intervals, pattern):
+        try:
+            self.gti = fixtures.fragmented_gtis(array_size, n_intervals,
+                                                pattern)
+        except ValueError:
+            raise NotImplementedError("too many GTIs for the lightcurve")
+        self.times = fixtures.times(array_size)
+
+    def time_create_gti_mask(self, array_size, n_intervals, pattern):
+        create_gti_mask(self.times, self.gti, dt=1.0)
+
+    def peakmem_create_gti_mask(self, array_size, n_intervals, pattern):
+        create_gti_mask(self.times, self.gti, dt=1.0)
+
+    def time_searchsorted(self, array_size, n_intervals, pattern):
+        gtis.gti_mask(self.times, self.gti, dt=1.0)
+
+    def peakmem_searchsorted(self, array_size, n_intervals, pattern):
+        gtis.gti_mask(self.times, self.gti, dt=1.0)
+
+    def teardown(self, array_size, n_intervals, pattern):
+        del self.times, self.gti
 
 
 # class MakeLIghtcurve:
@@ -0,0 +1,231 @@
+try:
+    from stingray import Crossspectrum, Lightcurve, Powerspectrum
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import fixtures
+from .batch import LightcurveBatch
+
+batch_sizes = [10, 1000, 10**5]
+batch_bins = 256
+
+
+def _counts(n_curves, seed=fixtures.DEFAULT_SEED):
+    counts = fixtures.white_noise(n_curves * batch_bins, seed)
+    return counts.reshape(n_curves, batch_bins)
+
+
+# Largest batch the loops over separate light curves are benchmarked on.
+# At 0.4 to 8 ms per light curve, the separate rebinning, addition and
+# cross spectra of 10**5 light curves take 40 s to 13 minutes per call, and
+# asv needs several calls within the timeout.
+max_separate_curves = 1000
+
+
+def _skip_separate(n_curves):
+    if n_curves > max_separate_curves:
+        raise NotImplementedError("too slow for {} light curves".format(
+            n_curves))
+
+
+class _BatchBenchmark:
+    """
+    Base class comparing one ``LightcurveBatch`` of ``n_curves`` light
+    curves against the same light curves as separate ``Lightcurve`` objects.
+    Slow loops over separate light curves skip the largest batch.
+    """
+    params = batch_sizes
+    param_names = ['n_curves']
+    timeout = 900.0
+
+    def setup(self, n_curves):
+        self.time = fixtures.times(batch_bins)
+        self.batch = LightcurveBatch(self.time, _counts(n_curves), 1.0)
+        self.lcs = [Lightcurve(self.time, counts, dt=1.0, skip_checks=True)
+                    for counts in self.batch.counts]
+
+    def teardown(self, n_curves):
+        del self.batch
+        del self.lcs
+
+
+class Init(_BatchBenchmark):
+    """
+    Time and Memory benchmarks for building a batch of light curves.
+    """
+    def setup(self, n_curves):
+        self.time = fixtures.times(batch_bins)
+        self.counts = _counts(n_curves)
+
+    def time_batch(self, n_curves):
+        LightcurveBatch(self.time, self.counts, 1.0)
+
+    def peakmem_batch(self, n_curves):
+        LightcurveBatch(self.time, self.counts, 1.0)
+
+    def time_separate(self, n_curves):
+        [Lightcurve(self.time, counts, dt=1.0, skip_checks=True)
+         for counts in self.counts]
+
+    def peakmem_separate(self, n_curves):
+        [Lightcurve(self.time, counts, dt=1.0, skip_checks=True)
+         for counts in self.counts]
+
+    def teardown(self, n_curves):
+        del self.counts
+
+
+class _RebinBenchmark(_BatchBenchmark):
+    """
+    Base class computing the errors to rebin outside the timings.
+    """
+    def setup(self, n_curves):
+        super().setup(n_curves)
+        # Errors are computed lazily; compute them outside the timings.
+        self.batch.counts_err
+        for lc in self.lcs:
+            lc.counts_err
+
+
+class Rebin(_RebinBenchmark):
+    """
+    Time and Memory benchmarks for rebinning a batch of light curves.
+    """
+    def time_batch(self, n_curves):
+        self.batch.rebin(4.0)
+
+    def peakmem_batch(self, n_curves):
+        self.batch.rebin(4.0)
+
+
+class SeparateRebin(_RebinBenchmark):
+    """
+    Time and Memory benchmarks for rebinning the light curves of ``Rebin``
+    one ``Lightcurve`` at a time.
+    """
+    def setup(self, n_curves):
+        # About 2 ms per light curve.
+        _skip_separate(n_curves)
+        super().setup(n_curves)
+
+    def time_separate(self, n_curves):
+        [lc.rebin(4.0) for lc in self.lcs]
+
+    def peakmem_separate(self, n_curves):
+        [lc.rebin(4.0) for lc in self.lcs]
+
+
+class _AddBenchmark(_BatchBenchmark):
+    """
+    Base class adding a second batch of light curves to add.
+    """
+    def setup(self, n_curves):
+        super().setup(n_curves)
+        self.other = LightcurveBatch(
+            self.time, _counts(n_curves, fixtures.DEFAULT_SEED + 1), 1.0)
+        self.others = [Lightcurve(self.time, counts, dt=1.0,
+                                  skip_checks=True)
+                       for counts in self.other.counts]
+        for batch, lcs in ((self.batch, self.lcs), (self.other, self.others)):
+            batch.counts_err
+            for lc in lcs:
+                lc.counts_err
+
+    def teardown(self, n_curves):
+        super().teardown(n_curves)
+        del self.other
+        del self.others
+
+
+class Add(_AddBenchmark):
+    """
+    Time and Memory benchmarks for adding two batches of light curves.
+    """
+    def time_batch(self, n_curves):
+        self.batch + self.other
+
+    def peakmem_batch(self, n_curves):
+        self.batch + self.other
+
+
+class SeparateAdd(_AddBenchmark):
+    """
+    Time and Memory benchmarks for adding the light curves of ``Add`` one
+    ``Lightcurve`` at a time.
+    """
+    def setup(self, n_curves):
+        # About 0.4 ms per light curve.
+        _skip_separate(n_curves)
+        super().setup(n_curves)
+
+    def time_separate(self, n_curves):
+        [lc + other for lc, other in zip(self.lcs, self.others)]
+
+    def peakmem_separate(self, n_curves):
+        [lc + other for lc, other in zip(self.lcs, self.others)]
+
+
+class Powerspectra(_BatchBenchmark):
+    """
+    Time and Memory benchmarks for the power spectra of a batch of light
+    curves, from one 2D FFT or one ``Powerspectrum`` per light curve.
+    """
+    def time_batch(self, n_curves):
+        self.batch.powerspectrum(norm='frac')
+
+    def peakmem_batch(self, n_curves):
+        self.batch.powerspectrum(norm='frac')
+
+    def time_separate(self, n_curves):
+        [Powerspectrum(lc, norm='frac') for lc in self.lcs]
+
+    def peakmem_separate(self, n_curves):
+        [Powerspectrum(lc, norm='frac') for lc in self.lcs]
+
+
+class _CrossspectrumBenchmark(_BatchBenchmark):
+    """
+    Base class adding a reference light curve to cross every light curve
+    of the batch against.
+    """
+    def setup(self, n_curves):
+        super().setup(n_curves)
+        self.reference = Lightcurve(
+            self.time, fixtures.white_noise(batch_bins,
+                                            fixtures.DEFAULT_SEED + 1),
+            dt=1.0, skip_checks=True)
+
+    def teardown(self, n_curves):
+        super().teardown(n_curves)
+        del self.reference
+
+
+class Crossspectra(_CrossspectrumBenchmark):
+    """
+    Time and Memory benchmarks for the cross spectra of every light curve
+    of a batch against one reference light curve, from one 2D FFT.
+    """
+    def time_batch(self, n_curves):
+        self.batch.crossspectrum(self.reference, norm='frac')
+
+    def peakmem_batch(self, n_curves):
+        self.batch.crossspectrum(self.reference, norm='frac')
+
+
+class SeparateCrossspectra(_CrossspectrumBenchmark):
+    """
+    Time and Memory benchmarks for the same cross spectra as
+    ``Crossspectra``, from one ``Crossspectrum`` per light curve.
+    """
+    def setup(self, n_curves):
+        # About 8 ms per light curve.
+        _skip_separate(n_curves)
+        super().setup(n_curves)
+
+    def time_separate(self, n_curves):
+        [Crossspectrum(lc, self.reference, norm='frac') for lc in self.lcs]
+
+    def peakmem_separate(self, n_curves):
+        [Crossspectrum(lc, self.reference, norm='frac') for lc in self.lcs]
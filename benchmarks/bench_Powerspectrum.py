@@ -1,13 +1,17 @@
-import numpy as np
-
 try:
-    from stingray import Lightcurve, Powerspectrum
+    from stingray import Powerspectrum
 except ImportError:
     import sys
     print("Install stingray first")
     sys.exit()
 
+from . import fixtures, memo
+
 test_arr_size = [10**i for i in range(3, 7)]
+derived_products = {
+    'classical_significances': {},
+    'compute_rms': dict(min_freq=0.001, max_freq=0.499),
+}
 
 
 class Init:
@@ -19,10 +23,7 @@ class Init:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-
-        self.lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        self.lc = fixtures.lightcurve(array_size)
 
     def time_init(self, array_size):
         Powerspectrum(self.lc)
@@ -43,9 +44,7 @@ class Rebin:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-        lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        lc = fixtures.lightcurve(array_size)
 
         self.pspec = Powerspectrum(lc)
 
@@ -68,9 +67,7 @@ class ClassificalSignificance:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-        lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        lc = fixtures.lightcurve(array_size)
 
         self.pspec = Powerspectrum(lc, norm="leahy")
 
@@ -93,9 +90,7 @@ class ComputeRMS:
     timeout = 120.0
 
     def setup(self, array_size):
-        times = np.arange(array_size)
-        counts = np.random.rand(array_size) * 100
-        lc = Lightcurve(times, counts, dt=1.0, skip_checks=True)
+        lc = fixtures.lightcurve(array_size)
 
         self.pspec = Powerspectrum(lc)
 
@@ -107,3 +102,55 @@ class ComputeRMS:
 
     def teardown(self, array_size):
         del self.pspec
+
+
+class _DerivedProduct:
+    """
+    Base class for benchmarks of derived products of a power spectra,
+    memoised with ``memo.derived``.
+    """
+    params = [test_arr_size, list(derived_products)]
+    param_names = ['array_size', 'product']
+    timeout = 120.0
+
+    def setup(self, array_size, product):
+        lc = fixtures.lightcurve(array_size)
+
+        self.pspec = Powerspectrum(lc, norm="leahy")
+
+    def _derive(self, product):
+        return memo.derived(self.pspec, product, **derived_products[product])
+
+    def teardown(self, array_size, product):
+        del self.pspec
+
+
+class DerivedFirstCall(_DerivedProduct):
+    """
+    Time and Memory benchmarks for the first, computing call of a memoised
+    derived product of a power spectra.
+    """
+    # The result is cached on the spectrum: start from a fresh one.
+    number = 1
+
+    def time_first(self, array_size, product):
+        self._derive(product)
+
+    def peakmem_first(self, array_size, product):
+        self._derive(product)
+
+
+class DerivedRepeatedCall(_DerivedProduct):
+    """
+    Time and Memory benchmarks for repeated, cached calls of a memoised
+    derived product of a power spectra.
+    """
+    def setup(self, array_size, product):
+        super().setup(array_size, product)
+        self._derive(product)
+
+    def time_repeated(self, array_size, product):
+        self._derive(product)
+
+    def peakmem_repeated(self, array_size, product):
+        self._derive(product)
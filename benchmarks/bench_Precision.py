@@ -0,0 +1,143 @@
+import numpy as np
+
+try:
+    from stingray import AveragedCrossspectrum
+except ImportError:
+    import sys
+    print("Install stingray first")
+    sys.exit()
+
+from . import fixtures, spectral
+
+test_arr_size = [10**i for i in range(4, 7)]
+precisions = ['float64', 'float32']
+segment_size = 1000
+
+
+def _counts(array_size, seed, dtype):
+    # Whole counts, exactly representable in single precision, so only the
+    # arithmetic contributes to the errors.
+    return np.floor(fixtures.white_noise(array_size, seed)).astype(dtype)
+
+
+def _max_relative_error(value, reference):
+    """
+    Largest deviation from ``reference``, relative to the largest
+    ``reference`` magnitude, so that values crossing zero (time lags) do
+    not dominate.
+    """
+    return float(np.max(np.abs(value - reference)) /
+                 np.max(np.abs(reference)))
+
+
+class _PrecisionBenchmark:
+    """
+    Base class for segment averages of ``segment_size`` bins computed in
+    single or double precision.
+    """
+    params = [test_arr_size, precisions]
+    param_names = ['array_size', 'dtype']
+    timeout = 120.0
+    cross = True
+
+    def setup(self, array_size, dtype):
+        self.counts1 = _counts(array_size, fixtures.DEFAULT_SEED, dtype)
+        self.counts2 = None
+        if self.cross:
+            self.counts2 = _counts(array_size, fixtures.DEFAULT_SEED + 1,
+                                   dtype)
+
+    def _average(self, dtype):
+        return spectral.parallel_average(self.counts1, self.counts2,
+                                         segment_size, n_workers=1,
+                                         dtype=dtype)
+
+    def _reference(self):
+        return spectral.parallel_average(
+            self.counts1.astype(np.float64),
+            None if self.counts2 is None else self.counts2.astype(np.float64),
+            segment_size, n_workers=1)
+
+    def teardown(self, array_size, dtype):
+        del self.counts1
+        del self.counts2
+
+
+class AveragedPower(_PrecisionBenchmark):
+    """
+    Time and Memory benchmarks for averaged power spectra in single and
+    double precision, and the error of single precision powers.
+    """
+    cross = False
+
+    def time_average(self, array_size, dtype):
+        self._average(dtype)
+
+    def peakmem_average(self, array_size, dtype):
+        self._average(dtype)
+
+    def track_power_error(self, array_size, dtype):
+        return _max_relative_error(self._average(dtype).power,
+                                   self._reference().power)
+
+    track_power_error.unit = 'relative error'
+
+
+class AveragedCross(_PrecisionBenchmark):
+    """
+    Time and Memory benchmarks for averaged cross spectra in single and
+    double precision, and the errors of single precision powers, coherence
+    and time lags.
+    """
+    def time_average(self, array_size, dtype):
+        self._average(dtype)
+
+    def peakmem_average(self, array_size, dtype):
+        self._average(dtype)
+
+    def track_power_error(self, array_size, dtype):
+        return _max_relative_error(self._average(dtype).power,
+                                   self._reference().power)
+
+    track_power_error.unit = 'relative error'
+
+    def track_coherence_error(self, array_size, dtype):
+        return _max_relative_error(self._average(dtype).coherence(),
+                                   self._reference().coherence())
+
+    track_coherence_error.unit = 'relative error'
+
+    def track_time_lag_error(self, array_size, dtype):
+        return _max_relative_error(self._average(dtype).time_lag(),
+                                   self._reference().time_lag())
+
+    track_time_lag_error.unit = 'relative error'
+
+
+class StingrayAveragedCross:
+    """
+    Time and Memory benchmarks for AveragedCrossspectrum on single and
+    double precision light curves, which stingray computes in double
+    precision either way.
+    """
+    params = [test_arr_size, precisions]
+    param_names = ['array_size', 'dtype']
+    timeout = 120.0
+
+    def setup(self, array_size, dtype):
+        self.lc1 = fixtures.lightcurve(array_size, dtype=dtype)
+        self.lc2 = fixtures.lightcurve(array_size,
+                                       seed=fixtures.DEFAULT_SEED + 1,
+                                       dtype=dtype)
+
+    def time_average(self, array_size, dtype):
+        AveragedCrossspectrum(self.lc1, self.lc2, segment_size,
+                              silent=True)
+
+    def peakmem_average(self, array_size, dtype):
+        AveragedCrossspectrum(self.lc1, self.lc2, segment_size,
+                              silent=True)
+
+    def teardown(self, array_size, dtype):
+        del self.lc1
+        del self.lc2
@@ -1,122 +1,245 @@
-from subprocess import call
-from sys import executable, exit
-import re
+import hashlib
+import json
+import os
+import sys
+
+from . import dependencies, fixtures, importtime
+
+
+def _core_dependencies():
+    try:
+        return dependencies.requirements()[0]
+    except ImportError:
+        return ['numpy', 'astropy', 'scipy', 'matplotlib']
+
+
+core_dependencies = _core_dependencies()
 
 
 class Dependencies:
     """
-    Track number of dependencies.
+    Track number of dependencies and their installed size.
     """
     def setup(self):
         try:
-            # replace with absolute path to your setup.cfg
-            with open('/home/apollo/stingray/setup.cfg', 'r+') as f_ptr:
-                content = f_ptr.read()
-
-            substr1 = 'install_requires =\n'
-            substr2 = '[options.entry_points]'
-            substr3 = 'all =\n'
-            substr4 = 'test =\n'
-
-            start_idx1 = content.index(substr1)
-            end_idx1 = content.index(substr2)
-            start_idx1 += len(substr1)
-
-            start_idx2 = content.index(substr3)
-            end_idx2 = content.index(substr4)
-            start_idx2 += len(substr3)
-
-            base_imports = content[start_idx1:end_idx1]
-            self.core_import_list = [
-                re.sub(r"[^a-zA-Z]+", '', char)
-                for char in base_imports.split("\n") if char
-            ]
-
-            opt_imports = content[start_idx2:end_idx2]
-            self.opt_import_list = [
-                re.sub(r"[^a-zA-Z]+", '', char)
-                for char in opt_imports.split("\n") if char
-            ]
-
-        except (FileNotFoundError, ValueError):
-            exit()
+            self.core, _ = dependencies.requirements()
+        except ImportError:
+            raise NotImplementedError("stingray metadata not available")
+        self.optional = dependencies.optional_requirements()
 
     def track_core_dependencies(self):
-        return len(self.base_import_list)
+        return len(self.core)
+
+    track_core_dependencies.unit = 'dependencies'
 
     def track_optional_dependencies(self):
-        return len(self.opt_import_list)
+        return len(self.optional)
+
+    track_optional_dependencies.unit = 'dependencies'
+
+    def track_installed_bytes(self):
+        return dependencies.installed_size(dependencies.PROJECT)
+
+    track_installed_bytes.unit = 'bytes'
+
+    def track_core_installed_bytes(self):
+        return sum(dependencies.installed_size(name) or 0
+                   for name in self.core)
+
+    track_core_installed_bytes.unit = 'bytes'
+
+
+class DependencyFootprint:
+    """
+    Track the installed size of each core dependency and the resident
+    memory importing it adds to a fresh interpreter.
+    """
+    params = core_dependencies
+    param_names = ['dependency']
+    timeout = 300.0
+
+    def setup_cache(self):
+        profile = importtime.profile_import('pass')
+        if not profile.own_peak:
+            raise NotImplementedError("child peak memory not available")
+        baseline = profile.max_rss
+        return {name: dependencies.import_rss(name, baseline)
+                for name in core_dependencies
+                if dependencies.distribution(name) is not None}
+
+    def setup(self, import_rss, dependency):
+        if dependency not in import_rss:
+            raise NotImplementedError("{} not installed".format(dependency))
+
+    def track_installed_bytes(self, import_rss, dependency):
+        return dependencies.installed_size(dependency)
+
+    track_installed_bytes.unit = 'bytes'
+
+    def track_import_rss(self, import_rss, dependency):
+        return import_rss[dependency]
+
+    track_import_rss.unit = 'bytes'
+
+
+# Statements profiled, by benchmark parameter name.
+IMPORTS = [
+    ('stingray', 'import stingray'),
+    ('Lightcurve', 'from stingray import Lightcurve'),
+    ('Powerspectrum', 'from stingray import Lightcurve, Powerspectrum'),
+    ('AveragedPowerspectrum',
+     'from stingray import Lightcurve, AveragedPowerspectrum'),
+    ('DynamicalPowerspectrum',
+     'from stingray import Lightcurve, DynamicalPowerspectrum'),
+    ('Crossspectrum', 'from stingray import Lightcurve, Crossspectrum'),
+    ('AveragedCrossspectrum',
+     'from stingray import Lightcurve, AveragedCrossspectrum'),
+    ('Bispectra', 'from stingray.bispectrum import Bispectrum'),
+    ('CrossCorrelation',
+     'from stingray.crosscorrelation import CrossCorrelation'),
+    ('Covariancepectrum',
+     'from stingray import Lightcurve, Covariancespectrum'),
+    ('AveragedCovariancepectrum',
+     'from stingray import Lightcurve, AveragedCovariancespectrum'),
+]
+import_names = [name for name, _ in IMPORTS]
+
+# Number of packages, the slowest to import with stingray, tracked by
+# HeavyModules.
+n_heavy_modules = 5
+
+
+def _heavy_modules(n=n_heavy_modules):
+    """
+    The ``n`` packages with the largest cumulative import time in a
+    profile of ``import stingray``, or the core dependencies if it cannot
+    be profiled.
+
+    asv imports this file in every benchmark process, and all of them must
+    see the same parameters, so the list is profiled once per interpreter
+    and stingray version and kept in the fixtures cache.
+    """
+    dist = dependencies.distribution(dependencies.PROJECT)
+    if dist is None or sys.version_info < (3, 7):
+        return list(core_dependencies)
+    key = hashlib.sha1('{} {} {} {}'.format(
+        sys.executable, sys.version, dist.version, n).encode()).hexdigest()
+    path = os.path.join(fixtures.cache_dir(),
+                        'heavy_modules_{}.json'.format(key[:16]))
+    if not os.path.exists(path):
+        profile = importtime.best_profile('import stingray')
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp, 'w') as f_ptr:
+            json.dump(profile.heaviest(n, exclude=[dependencies.PROJECT]),
+                      f_ptr)
+        os.replace(tmp, path)
+    with open(path) as f_ptr:
+        return json.load(f_ptr)
+
+
+heavy_modules = _heavy_modules()
+
+
+# Statements for ColdStart that touch a lazily loaded attribute, where the
+# import alone would not: a lazy ``import stingray`` loads nothing.
+COLD_START_STATEMENTS = dict(
+    IMPORTS, stingray='import stingray; stingray.Lightcurve')
+
+# Loads benchmarks/lazy.py into a fresh interpreter as a plain script.
+LAZY_SETUP = "import runpy; install = runpy.run_path({!r})['install']".format(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lazy.py'))
+
+
+def _profile_imports():
+    if sys.version_info < (3, 7):
+        raise NotImplementedError("-X importtime needs Python 3.7")
+    return {name: importtime.best_profile(statement)
+            for name, statement in IMPORTS}
 
 
 class Imports:
     """
-    Time and Memory benchmarks for importing stingray.
+    Track import time and memory of stingray, each import profiled in a
+    fresh interpreter.
     """
-    def execute(self, command):
-        call((executable, '-c', command))
+    params = import_names
+    param_names = ['statement']
+    timeout = 600.0
 
-    def time_stingray(self):
-        self.execute('import stingray')
+    def setup_cache(self):
+        return _profile_imports()
 
-    def time_Lightcurve(self):
-        self.execute('from stingray import Lightcurve')
+    def track_import_seconds(self, profiles, statement):
+        return profiles[statement].total()
 
-    def time_Powerspectrum(self):
-        self.execute('from stingray import Lightcurve, Powerspectrum')
+    track_import_seconds.unit = 'seconds'
 
-    def time_AveragedPowerspectrum(self):
-        self.execute('from stingray import Lightcurve, AveragedPowerspectrum')
+    def track_max_rss(self, profiles, statement):
+        return profiles[statement].max_rss
 
-    def time_DynamicalPowerspectrum(self):
-        self.execute('from stingray import Lightcurve, DynamicalPowerspectrum')
+    track_max_rss.unit = 'bytes'
 
-    def time_Crossspectrum(self):
-        self.execute('from stingray import Lightcurve, Crossspectrum')
+    def track_modules(self, profiles, statement):
+        return len(profiles[statement].modules())
 
-    def time_AveragedCrossspectrum(self):
-        self.execute('from stingray import Lightcurve, AveragedCrossspectrum')
+    track_modules.unit = 'modules'
 
-    def time_Bispectra(self):
-        self.execute('from stingray.bispectrum import Bispectrum')
 
-    def time_CrossCorrelation(self):
-        self.execute('from stingray.crosscorrelation import CrossCorrelation')
+class HeavyModules:
+    """
+    Track the import time spent in each of the packages that are slowest
+    to import with stingray, in their own modules and including the
+    packages they pull in.
+    """
+    params = [import_names, heavy_modules]
+    param_names = ['statement', 'module']
+    timeout = 600.0
 
-    def time_Covariancepectrum(self):
-        self.execute('from stingray import Lightcurve, Covariancespectrum')
+    def setup_cache(self):
+        return _profile_imports()
 
-    def time_AveragedCovariancepectrum(self):
-        self.execute('from stingray import Lightcurve, Covariancespectrum')
+    def track_package_seconds(self, profiles, statement, module):
+        return profiles[statement].package_time(module)
 
-    def peakmem_stingray(self):
-        self.execute('import stingray')
+    track_package_seconds.unit = 'seconds'
 
-    def peakmem_Lightcurve(self):
-        self.execute('from stingray import Lightcurve')
+    def track_cumulative_seconds(self, profiles, statement, module):
+        return profiles[statement].package_cumulative(module)
 
-    def peakmem_Powerspectrum(self):
-        self.execute('from stingray import Lightcurve, Powerspectrum')
+    track_cumulative_seconds.unit = 'seconds'
 
-    def peakmem_AveragedPowerspectrum(self):
-        self.execute('from stingray import Lightcurve, AveragedPowerspectrum')
 
-    def peakmem_DynamicalPowerspectrum(self):
-        self.execute('from stingray import Lightcurve, DynamicalPowerspectrum')
+class ColdStart:
+    """
+    Track the cold start of a fresh interpreter running each stingray
+    import, with the package loaded eagerly and lazily. Each import uses at
+    least one stingray class, so the lazy mode pays for what it defers.
+    """
+    params = [import_names, ['eager', 'lazy']]
+    param_names = ['statement', 'mode']
+    timeout = 600.0
+
+    def setup_cache(self):
+        if sys.version_info < (3, 7):
+            raise NotImplementedError("-X importtime needs Python 3.7")
+        profiles = {}
+        for name, statement in COLD_START_STATEMENTS.items():
+            profiles[name, 'eager'] = importtime.best_profile(statement)
+            profiles[name, 'lazy'] = importtime.best_profile(
+                'install(); ' + statement, setup=LAZY_SETUP)
+        return profiles
 
-    def peakmem_Crossspectrum(self):
-        self.execute('from stingray import Lightcurve, Crossspectrum')
+    def track_import_seconds(self, profiles, statement, mode):
+        return profiles[statement, mode].total()
 
-    def peakmem_AveragedCrossspectrum(self):
-        self.execute('from stingray import Lightcurve, AveragedCrossspectrum')
+    track_import_seconds.unit = 'seconds'
 
-    def peakmem_Bispectra(self):
-        self.execute('from stingray.bispectrum import Bispectrum')
+    def track_wall_seconds(self, profiles, statement, mode):
+        return profiles[statement, mode].wall_time
 
-    def peakmem_CrossCorrelation(self):
-        self.execute('from stingray.crosscorrelation import CrossCorrelation')
+    track_wall_seconds.unit = 'seconds'
 
-    def peakmem_Covariancepectrum(self):
-        self.execute('from stingray import Lightcurve, Covariancespectrum')
+    def track_max_rss(self, profiles, statement, mode):
+        return profiles[statement, mode].max_rss
 
-    def peakmem_AveragedCovariancepectrum(self):
-        self.execute('from stingray import Lightcurve, Covariancespectrum')
+    track_max_rss.unit = 'bytes'
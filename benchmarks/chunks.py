@@ -0,0 +1,233 @@
+"""
+Segment-wise analysis of light curves without a Python call per segment.
+
+``Lightcurve.analyze_segments`` (and the deprecated ``analyze_lc_chunks``)
+slices a new ``Lightcurve`` for every segment and calls the user function
+on it, so short segments are dominated by per-call overhead. This module
+offers three alternatives on the same segments:
+
+* ``reduce_segments`` computes the mean, variance, sum, minimum or maximum
+  of every segment at once, reshaping the array when the segments tile it
+  and using ``ufunc.reduceat`` otherwise;
+* ``map_segments`` calls an arbitrary function on every segment, spread
+  over a pool of worker processes in contiguous blocks;
+* ``iter_segments`` yields the results as segments (or blocks of segments,
+  with a pool) finish, instead of collecting them all first.
+"""
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+REDUCTIONS = ('mean', 'var', 'sum', 'min', 'max')
+
+
+class Segments:
+    """
+    Index and time bounds of the segments ``analyze_segments`` uses for an
+    evenly sampled light curve. Segments with less than two bins, which
+    stingray skips, and segments past the end of the data are left out.
+    """
+    def __init__(self, lc, segment_size, fraction_step=1):
+        from stingray.gti import bin_intervals_from_gtis
+
+        start, stop = bin_intervals_from_gtis(
+            lc.gti, segment_size, lc.time, fraction_step=fraction_step,
+            dt=lc.dt)
+        # bin_intervals_from_gtis can return segments running past the end
+        # of the light curve for some fraction_step, where stingray fails.
+        keep = (stop - start > 1) & (stop <= lc.time.size)
+        self.start = np.asarray(start)[keep]
+        self.stop = np.asarray(stop)[keep]
+        self.start_times = lc.time[self.start] - 0.5 * lc.dt
+        # As in stingray, one bin past the end of the segment.
+        self.stop_times = lc.time[self.stop - 1] + 1.5 * lc.dt
+
+    def __len__(self):
+        return self.start.size
+
+    @property
+    def tiled(self):
+        """Whether the segments are equally long and back to back."""
+        length = self.stop[0] - self.start[0]
+        return bool(np.all(self.stop - self.start == length) and
+                    np.all(self.start[1:] == self.stop[:-1]))
+
+    def reduceat(self, ufunc, values):
+        """``ufunc`` reduced over each segment of ``values``."""
+        # Interleaving the stops lets reduceat skip gaps and handle
+        # overlapping segments: every other result is a segment, and the
+        # padding keeps a stop at the end of the array a valid index.
+        indices = np.empty(2 * len(self), dtype=np.intp)
+        indices[0::2] = self.start
+        indices[1::2] = self.stop
+        padded = np.append(values, values[:1])
+        return ufunc.reduceat(padded, indices)[0::2]
+
+
+def _reduce(segments, values, reduction):
+    if not len(segments):
+        return np.array([])
+    if segments.tiled:
+        length = segments.stop[0] - segments.start[0]
+        rows = values[segments.start[0]:segments.stop[-1]].reshape(-1, length)
+        return getattr(np, reduction)(rows, axis=1)
+    if reduction == 'min':
+        return segments.reduceat(np.minimum, values)
+    if reduction == 'max':
+        return segments.reduceat(np.maximum, values)
+    nbins = segments.stop - segments.start
+    if reduction == 'sum':
+        return segments.reduceat(np.add, values)
+    # Shift by the global mean, so that the sums of squares below do not
+    # lose the variance to cancellation.
+    offset = np.mean(values)
+    means = segments.reduceat(np.add, values - offset) / nbins
+    if reduction == 'mean':
+        return means + offset
+    squares = segments.reduceat(np.add, (values - offset)**2) / nbins
+    return squares - means**2
+
+
+def reduce_segments(lc, segment_size, reduction='mean', fraction_step=1,
+                    attribute='counts'):
+    """
+    Like ``lc.analyze_segments(lambda x: np.<reduction>(x.counts),
+    segment_size)``, for one of the reductions in ``REDUCTIONS``.
+
+    Parameters
+    ----------
+    lc : stingray.Lightcurve
+        Evenly sampled light curve.
+    segment_size : float
+        Length of the segments, in the units of ``lc.time``.
+    reduction : str
+        Reduction to compute on every segment.
+    fraction_step : float
+        Step between the starts of consecutive segments, as a fraction of
+        ``segment_size``.
+    attribute : str
+        Array of ``lc`` to reduce.
+
+    Returns
+    -------
+    start_times, stop_times, results : np.ndarray
+    """
+    if reduction not in REDUCTIONS:
+        raise ValueError("Reduction {} not in {}".format(reduction,
+                                                         REDUCTIONS))
+    segments = Segments(lc, segment_size, fraction_step)
+    values = np.asarray(getattr(lc, attribute))
+    return (segments.start_times, segments.stop_times,
+            _reduce(segments, values, reduction))
+
+
+def _segment(lc, start, stop, start_time, stop_time):
+    segment = lc[start:stop]
+    segment.gti = np.asanyarray([[start_time, stop_time]])
+    return segment
+
+
+def _analyze_block(lc, bounds, func, **kwargs):
+    """``func`` on the segments of ``lc`` between ``bounds``."""
+    return [func(_segment(lc, *segment_bounds), **kwargs)
+            for segment_bounds in zip(*bounds)]
+
+
+def _blocks(lc, segments, n_blocks):
+    """
+    Split ``segments`` into ``n_blocks`` contiguous blocks, each with the
+    part of ``lc`` it covers and the segment bounds relative to it.
+    """
+    edges = np.linspace(0, len(segments), min(n_blocks, len(segments)) + 1)
+    for first, last in zip(edges[:-1].astype(int), edges[1:].astype(int)):
+        offset = segments.start[first]
+        end = segments.stop[first:last].max()
+        yield lc[offset:end], (segments.start[first:last] - offset,
+                               segments.stop[first:last] - offset,
+                               segments.start_times[first:last],
+                               segments.stop_times[first:last])
+
+
+def _pool(n_workers, executor):
+    if isinstance(executor, Executor):
+        return executor, None
+    pool_type = {'thread': ThreadPoolExecutor,
+                 'process': ProcessPoolExecutor}[executor]
+    pool = pool_type(n_workers)
+    return pool, pool
+
+
+def map_segments(lc, segment_size, func, fraction_step=1, n_workers=None,
+                 executor='process', **kwargs):
+    """
+    Like ``lc.analyze_segments(func, segment_size)``, with the segments
+    split in one contiguous block per worker.
+
+    ``func`` and ``kwargs`` are sent to worker processes, so they must be
+    picklable: module-level functions work, lambdas do not.
+
+    Parameters
+    ----------
+    n_workers : int, optional
+        Number of workers, ``os.cpu_count()`` by default. A single worker
+        runs in the calling thread.
+    executor : 'thread', 'process' or concurrent.futures.Executor
+        Pool to use. Pass an existing executor to reuse its workers.
+
+    Returns
+    -------
+    start_times, stop_times, results : np.ndarray
+    """
+    n_workers = n_workers or os.cpu_count()
+    segments = Segments(lc, segment_size, fraction_step)
+    blocks = list(_blocks(lc, segments, n_workers))
+    if n_workers == 1:
+        partials = [_analyze_block(sub_lc, bounds, func, **kwargs)
+                    for sub_lc, bounds in blocks]
+    else:
+        executor, pool = _pool(n_workers, executor)
+        try:
+            partials = list(executor.map(
+                functools.partial(_analyze_block, func=func, **kwargs),
+                *zip(*blocks)))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    results = [result for partial in partials for result in partial]
+    return segments.start_times, segments.stop_times, np.array(results)
+
+
+def iter_segments(lc, segment_size, func, fraction_step=1, n_workers=None,
+                  executor=None, **kwargs):
+    """
+    Yield ``(start_time, stop_time, result)`` for every segment of ``lc``
+    as soon as ``func`` has analysed it.
+
+    Without ``executor`` the segments are analysed one at a time, in order,
+    as the generator is consumed. With one, they are split in blocks as in
+    ``map_segments`` and the results of each block are yielded when it
+    completes, so blocks may come out of order.
+    """
+    segments = Segments(lc, segment_size, fraction_step)
+    if executor is None:
+        for bounds in zip(segments.start, segments.stop,
+                          segments.start_times, segments.stop_times):
+            yield bounds[2], bounds[3], func(_segment(lc, *bounds),
+                                             **kwargs)
+        return
+    n_workers = n_workers or os.cpu_count()
+    executor, pool = _pool(n_workers, executor)
+    try:
+        futures = {executor.submit(_analyze_block, sub_lc, bounds, func,
+                                   **kwargs): bounds
+                   for sub_lc, bounds in _blocks(lc, segments, n_workers)}
+        for future in as_completed(futures):
+            bounds = futures[future]
+            for item in zip(bounds[2], bounds[3], future.result()):
+                yield item
+    finally:
+        if pool is not None:
+            pool.shutdown()
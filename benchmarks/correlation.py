@@ -0,0 +1,98 @@
+"""
+Cross-correlation of light curves over a limited lag range.
+
+``cross_correlation`` follows ``stingray.crosscorrelation.CrossCorrelation``
+(mean subtracted counts, ``scipy.signal.correlate`` lag convention) but only
+computes lags up to ``maxlag``, either directly, one dot product per lag at
+``O(n * maxlag)``, or from one zero-padded FFT at ``O(n log n)``.
+"""
+import time
+
+import numpy as np
+
+from .segments import next_fast_len
+
+
+def _direct(x, y, maxlag):
+    n = x.size
+    corr = np.empty(2 * maxlag + 1)
+    for i, lag in enumerate(range(-maxlag, maxlag + 1)):
+        if lag >= 0:
+            corr[i] = np.dot(x[lag:], y[:n - lag])
+        else:
+            corr[i] = np.dot(x[:n + lag], y[-lag:])
+    return corr
+
+
+def _fft(x, y, maxlag):
+    # Padding by maxlag keeps the circular wrap-around out of the lags kept.
+    n_fft = next_fast_len(x.size + maxlag)
+    full = np.fft.irfft(np.fft.rfft(x, n_fft) * np.fft.rfft(y, n_fft).conj(),
+                        n_fft)
+    return np.concatenate((full[n_fft - maxlag:], full[:maxlag + 1]))
+
+
+METHODS = {
+    'direct': _direct,
+    'fft': _fft,
+}
+
+
+def cross_correlation(counts1, counts2, maxlag=None, dt=1.0,
+                      method='fft'):
+    """
+    Cross-correlation of two evenly sampled light curves of equal length.
+
+    Parameters
+    ----------
+    counts1, counts2 : np.ndarray
+        Counts of the two light curves.
+    maxlag : int, optional
+        Largest lag, in bins. All lags by default.
+    dt : float
+        Bin width.
+    method : 'direct' or 'fft'
+
+    Returns
+    -------
+    time_lags, corr : np.ndarray
+        Lags from ``-maxlag * dt`` to ``maxlag * dt`` and the correlation at
+        each of them, ``sum(x[i + lag] * y[i])`` of the mean subtracted
+        counts.
+    """
+    n = len(counts1)
+    if maxlag is None:
+        maxlag = n - 1
+    if not 0 <= maxlag < n:
+        raise ValueError("maxlag must be between 0 and {}".format(n - 1))
+    x = counts1 - np.mean(counts1)
+    y = counts2 - np.mean(counts2)
+    corr = METHODS[method](x, y, maxlag)
+    return np.arange(-maxlag, maxlag + 1) * dt, corr
+
+
+def correlation_cost(n, maxlag, method, repeat=3):
+    """Best-of-``repeat`` time of ``cross_correlation`` on ``n`` bins."""
+    rng = np.random.RandomState(n)
+    counts1 = rng.uniform(0, 100, n)
+    counts2 = rng.uniform(0, 100, n)
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cross_correlation(counts1, counts2, maxlag, method=method)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def crossover_maxlag(n, repeat=3):
+    """
+    Smallest power of two ``maxlag`` for which the FFT method is faster
+    than the direct one on ``n`` bins, or ``n`` if it never is.
+    """
+    maxlag = 1
+    while maxlag < n:
+        if (correlation_cost(n, maxlag, 'fft', repeat) <
+                correlation_cost(n, maxlag, 'direct', repeat)):
+            return maxlag
+        maxlag *= 2
+    return n
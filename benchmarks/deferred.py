@@ -0,0 +1,158 @@
+"""
+Light curves that only store their arrays when built.
+
+``DeferredLightcurve`` keeps ``time`` and ``counts`` as given and works out
+everything else the first time it is asked for: ``dt`` (the median bin
+spacing, as in stingray), the GTIs, ``counts_err`` and ``countrate``.
+``validate`` runs stingray's construction checks (finite values inside the
+GTIs, sorted and evenly sampled times) from a single ``np.diff`` of the
+times, where ``Lightcurve`` computes it three times, and caches the
+outcome.
+"""
+import warnings
+
+import numpy as np
+
+from . import errors
+from . import gtis as gti_tools
+
+
+class Validation:
+    """
+    Outcome of ``DeferredLightcurve.validate``: whether the times are
+    sorted and evenly sampled, and which arrays hold non-finite values
+    outside the GTIs.
+    """
+    def __init__(self, is_sorted, is_even, nonfinite):
+        self.is_sorted = is_sorted
+        self.is_even = is_even
+        self.nonfinite = nonfinite
+
+
+class DeferredLightcurve:
+    """
+    An evenly sampled light curve with lazily derived attributes.
+
+    Parameters
+    ----------
+    time, counts : np.ndarray
+        Bin times and counts.
+    err : np.ndarray, optional
+        Errors on ``counts``, Poisson errors by default.
+    gti : np.ndarray, optional
+        Good time intervals, the span of ``time`` by default.
+    dt : float, optional
+        Bin width, the median spacing of ``time`` by default.
+    """
+    def __init__(self, time, counts, err=None, gti=None, dt=None):
+        if np.size(time) != np.size(counts):
+            raise ValueError("Time and counts array should have the same "
+                             "length.")
+        self.time = np.asanyarray(time)
+        self.counts = np.asanyarray(counts)
+        self._counts_err = None if err is None else np.asanyarray(err)
+        self._gti = None if gti is None else np.asanyarray(gti)
+        self._dt = dt
+        self._diff = None
+        self._countrate = None
+        self._validation = None
+
+    @property
+    def n(self):
+        return self.time.size
+
+    def _time_diff(self):
+        if self._diff is None:
+            self._diff = np.diff(self.time)
+        return self._diff
+
+    @property
+    def dt(self):
+        if self._dt is None:
+            self._dt = np.median(self._time_diff()) if self.n > 1 else 1.0
+        return self._dt
+
+    @property
+    def gti(self):
+        if self._gti is None:
+            self._gti = np.asarray([[self.time[0] - 0.5 * self.dt,
+                                     self.time[-1] + 0.5 * self.dt]])
+        return self._gti
+
+    @property
+    def counts_err(self):
+        if self._counts_err is None:
+            self._counts_err = errors.poisson_errors(self.counts)
+        return self._counts_err
+
+    @property
+    def countrate(self):
+        if self._countrate is None:
+            self._countrate = self.counts / self.dt
+        return self._countrate
+
+    @property
+    def countrate_err(self):
+        return self.counts_err / self.dt
+
+    def _steps_within_gtis(self, diff):
+        """Time steps between bins of the same GTI."""
+        if self._gti is None or len(self._gti) < 2:
+            return diff
+        which = np.searchsorted(self._gti[:, 0], self.time, side='right')
+        inside = gti_tools.gti_mask(self.time, self._gti, dt=0)
+        keep = inside[:-1] & inside[1:] & (which[:-1] == which[1:])
+        return diff[keep]
+
+    def validate(self, rtol=1e-5, atol=1e-8):
+        """
+        Check the light curve once and return the cached ``Validation``.
+
+        Raises ``ValueError`` if there are non-finite values inside the
+        GTIs; warns, like stingray, about non-finite values outside them
+        and about unsorted or unevenly sampled times.
+        """
+        if self._validation is not None:
+            return self._validation
+        diff = self._time_diff()
+        arrays = [('time', self.time), ('counts', self.counts),
+                  ('err', self._counts_err)]
+        nonfinite = [name for name, array in arrays
+                     if array is not None and not np.all(np.isfinite(array))]
+        if nonfinite:
+            if self._gti is None:
+                raise ValueError("Nonfinite values inside GTIs in {}".format(
+                    ', '.join(nonfinite)))
+            mask = gti_tools.gti_mask(self.time, self._gti, dt=0)
+            inside = [name for name, array in arrays if name in nonfinite
+                      and not np.all(np.isfinite(array[mask]))]
+            if inside:
+                raise ValueError("Nonfinite values inside GTIs in {}".format(
+                    ', '.join(inside)))
+            warnings.warn("There are non-finite points in the data, but "
+                          "they are outside GTIs. ")
+
+        is_sorted = bool(np.all(diff >= 0))
+        steps = self._steps_within_gtis(diff)
+        is_even = True
+        if steps.size:
+            # Two reductions replace the elementwise isclose of stingray:
+            # all steps are close to dt if the extreme ones are.
+            tolerance = atol + rtol * abs(self.dt)
+            is_even = bool(abs(steps.min() - self.dt) <= tolerance and
+                           abs(steps.max() - self.dt) <= tolerance)
+        if not is_sorted:
+            warnings.warn("The light curve is unsorted.")
+        if not is_even:
+            warnings.warn("Bin sizes in input time array aren't equal "
+                          "throughout! This could cause problems with "
+                          "Fourier transforms.")
+        self._validation = Validation(is_sorted, is_even, nonfinite)
+        return self._validation
+
+    def to_lightcurve(self):
+        """A stingray ``Lightcurve`` of the same data, without checks."""
+        from stingray import Lightcurve
+
+        return Lightcurve(self.time, self.counts, err=self._counts_err,
+                          gti=self.gti, dt=self.dt, skip_checks=True)
@@ -0,0 +1,132 @@
+"""
+Dependency footprint of the benchmarked project.
+
+Requirements are read from the installed distribution metadata, wherever
+asv installed the project, and every dependency is measured by the size of
+its installed files and by the resident memory a fresh interpreter gains
+when importing it.
+"""
+import os
+import re
+
+try:
+    from importlib import metadata
+except ImportError:
+    # Python < 3.8
+    try:
+        import importlib_metadata as metadata
+    except ImportError:
+        metadata = None
+
+from . import importtime
+
+PROJECT = 'stingray'
+
+# Extras that only matter for developing the project itself.
+DEVELOPMENT_EXTRAS = ('test', 'test-all', 'docs')
+
+_NAME = re.compile(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+_EXTRA = re.compile(r'''extra\s*==\s*['"]([^'"]+)['"]''')
+
+
+def canonical_name(name):
+    """Normalised distribution name, as in PEP 503."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def distribution(name):
+    """The installed distribution ``name``, or None."""
+    if metadata is None:
+        return None
+    try:
+        return metadata.distribution(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def requirements(project=PROJECT):
+    """
+    Core and optional requirements of ``project``.
+
+    Returns
+    -------
+    core : list of str
+        Names of the unconditional requirements.
+    optional : dict
+        Names of the requirements of each extra, leaving out the project
+        itself and requirements that are also core.
+    """
+    dist = distribution(project)
+    if dist is None:
+        raise ImportError("{} is not installed".format(project))
+    core, optional = [], {}
+    for requirement in dist.requires or ():
+        name = canonical_name(_NAME.match(requirement).group(1))
+        requirement, _, marker = requirement.partition(';')
+        extra = _EXTRA.search(marker)
+        if extra is None:
+            if name not in core:
+                core.append(name)
+        elif name != canonical_name(project):
+            optional.setdefault(extra.group(1), []).append(name)
+    for extra, names in optional.items():
+        optional[extra] = [name for name in names if name not in core]
+    return core, optional
+
+
+def optional_requirements(project=PROJECT, exclude=DEVELOPMENT_EXTRAS):
+    """Sorted names of the optional requirements outside ``exclude``."""
+    _, optional = requirements(project)
+    return sorted({name for extra, names in optional.items()
+                   if extra not in exclude for name in names})
+
+
+def installed_size(name):
+    """Bytes on disk of the files of the installed distribution ``name``."""
+    dist = distribution(name)
+    if dist is None:
+        return None
+    total = 0
+    for path in dist.files or ():
+        full_path = str(path.locate())
+        if os.path.isfile(full_path):
+            total += os.path.getsize(full_path)
+    return total
+
+
+def top_level_modules(name):
+    """Importable top-level modules of the installed distribution ``name``."""
+    dist = distribution(name)
+    modules = []
+    if dist is not None:
+        modules = (dist.read_text('top_level.txt') or '').split()
+        if not modules:
+            # Wheels built without setuptools have no top_level.txt.
+            for path in dist.files or ():
+                top = path.parts[0]
+                if (len(path.parts) > 1 and not top.endswith('-info') and
+                        top.isidentifier() and top not in modules):
+                    modules.append(top)
+    return [module for module in modules
+            if not module.startswith('_')] or [name.replace('-', '_')]
+
+
+def _own_peak(statement):
+    profile = importtime.profile_import(statement)
+    if not profile.own_peak:
+        # ru_maxrss starts from the parent's peak: the difference of two of
+        # them says nothing about the import.
+        raise NotImplementedError("child peak memory not available")
+    return profile.max_rss
+
+
+def import_rss(name, baseline=None):
+    """
+    Resident memory, in bytes, that importing the top-level modules of
+    ``name`` adds to a fresh interpreter: the difference between the peak
+    memory the child reports for the import and for ``pass``.
+    """
+    if baseline is None:
+        baseline = _own_peak('pass')
+    return _own_peak('import ' + ', '.join(top_level_modules(name))) - \
+        baseline
@@ -0,0 +1,17 @@
+"""
+Default errors on light curve counts, shared by the light curve variants.
+"""
+import numpy as np
+
+
+def poisson_errors(counts):
+    """
+    Symmetrical Poisson errors on ``counts``, of any shape, as stingray
+    computes them, or their square root without stingray.
+    """
+    try:
+        from stingray.utils import poisson_symmetrical_errors
+    except ImportError:
+        return np.sqrt(counts)
+    counts = np.asarray(counts)
+    return poisson_symmetrical_errors(counts.ravel()).reshape(counts.shape)
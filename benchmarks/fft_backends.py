@@ -0,0 +1,116 @@
+"""
+Interchangeable real FFT implementations for the ``spectral`` kernels.
+
+Every backend exposes ``rfft(x, axis=-1)``. Backends that support planning
+(pyFFTW) can cache one plan per input shape and reuse it for every segment
+of that shape. ``TimedBackend`` wraps any backend and accumulates the time
+spent inside the transforms, to separate FFT cost from Python overhead.
+"""
+import time
+
+import numpy as np
+
+
+class NumpyBackend:
+    """``numpy.fft``; no planning."""
+    name = 'numpy'
+    supports_planning = False
+
+    def __init__(self, planned=False):
+        self.planned = False
+
+    def rfft(self, x, axis=-1):
+        return np.fft.rfft(x, axis=axis)
+
+
+class ScipyBackend:
+    """``scipy.fft``; no planning, but keeps single precision inputs."""
+    name = 'scipy'
+    supports_planning = False
+
+    def __init__(self, planned=False):
+        import scipy.fft
+        self._fft = scipy.fft
+        self.planned = False
+
+    def rfft(self, x, axis=-1):
+        return self._fft.rfft(x, axis=axis)
+
+
+class PyFFTWBackend:
+    """
+    ``pyfftw``. Planned mode builds one FFTW plan per
+    ``(shape, dtype, axis)`` and reuses it for every later input of that
+    shape.
+    """
+    name = 'pyfftw'
+    supports_planning = True
+
+    def __init__(self, planned=False):
+        import pyfftw
+        import pyfftw.builders
+        import pyfftw.interfaces.numpy_fft
+        self._builders = pyfftw.builders
+        self._numpy_fft = pyfftw.interfaces.numpy_fft
+        self.planned = planned
+        self._plans = {}
+
+    def rfft(self, x, axis=-1):
+        if not self.planned:
+            return self._numpy_fft.rfft(x, axis=axis)
+        key = (x.shape, x.dtype.str, axis)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._builders.rfft(np.empty(x.shape, dtype=x.dtype),
+                                       axis=axis,
+                                       planner_effort='FFTW_MEASURE')
+            self._plans[key] = plan
+        # The plan owns its output buffer; copy it out, as numpy would
+        # allocate a fresh output anyway.
+        return plan(x).copy()
+
+
+BACKENDS = {
+    'numpy': NumpyBackend,
+    'scipy': ScipyBackend,
+    'pyfftw': PyFFTWBackend,
+}
+
+
+def get_backend(name, planned=False):
+    """
+    Return an instance of the ``name`` backend.
+
+    Raises ``ImportError`` if the backend is not installed and
+    ``ValueError`` if it cannot plan but ``planned`` was requested.
+    """
+    backend_type = BACKENDS[name]
+    if planned and not backend_type.supports_planning:
+        raise ValueError("{} does not support planning".format(name))
+    return backend_type(planned=planned)
+
+
+def available_backends():
+    """Names of the backends that can be imported here."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+class TimedBackend:
+    """Wrap a backend and add up the wall time spent in its transforms."""
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self.fft_time = 0.
+
+    def rfft(self, x, axis=-1):
+        start = time.perf_counter()
+        result = self.backend.rfft(x, axis=axis)
+        self.fft_time += time.perf_counter() - start
+        return result
@@ -0,0 +1,354 @@
+"""
+Seeded synthetic data shared by all benchmark suites.
+
+Every generator writes its output once to a ``.npy`` file keyed by
+``(kind, size, seed, dt)`` and returns a read-only memory map of that file,
+so all benchmark processes map the same pages in instead of rebuilding the
+arrays in ``setup``, and every run sees bit-identical inputs.
+
+The cache lives in ``$STINGRAY_BENCH_CACHE``, or in a ``stingray-benchmarks``
+directory below the system temporary directory if that is not set.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+DEFAULT_SEED = 20200601
+CHUNK_SIZE = 2**22
+
+# Bump whenever a generator changes, so stale cache files are not reused.
+_CACHE_VERSION = 1
+
+
+def cache_dir():
+    """Return the cache directory, creating it if needed."""
+    root = os.environ.get('STINGRAY_BENCH_CACHE',
+                          os.path.join(tempfile.gettempdir(),
+                                       'stingray-benchmarks'))
+    path = os.path.join(root, 'v{}'.format(_CACHE_VERSION))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(kind, size, seed, dt):
+    """Return the cache file name for the ``(kind, size, seed, dt)`` key."""
+    name = '{}_n{}_s{}_dt{!r}.npy'.format(kind, size, seed, float(dt))
+    return os.path.join(cache_dir(), name)
+
+
+def cached(kind, size, seed, dt, fill, shape=None, dtype=np.float64):
+    """
+    Return a read-only memory map of a cached array, generating it first if
+    it is not on disk yet.
+
+    Parameters
+    ----------
+    kind, size, seed, dt
+        The cache key.
+    fill : callable
+        ``fill(out, rng, dt)`` writes the data into the writable memory map
+        ``out``. ``rng`` is a ``np.random.RandomState`` seeded with ``seed``;
+        its stream is stable across numpy versions.
+    shape : tuple, optional
+        Shape of the array, ``(size,)`` by default.
+    dtype : numpy dtype, optional
+        Data type of the array.
+    """
+    path = cache_path(kind, size, seed, dt)
+    if not os.path.exists(path):
+        # Write to a private file and rename it into place, so concurrent
+        # benchmark processes never map a half-written array.
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=dtype,
+                                        shape=shape or (size,))
+        fill(out, np.random.RandomState(seed), dt)
+        out.flush()
+        del out
+        os.replace(tmp, path)
+    return np.load(path, mmap_mode='r')
+
+
+def _fill_chunks(out, draw):
+    """Fill ``out`` with ``draw(start, stop)`` one chunk at a time."""
+    for start in range(0, len(out), CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, len(out))
+        out[start:stop] = draw(start, stop)
+
+
+def times(size, dt=1.0):
+    """Evenly sampled bin times ``0, dt, 2 dt, ...``."""
+    def fill(out, rng, dt):
+        _fill_chunks(out, lambda start, stop: np.arange(start, stop) * dt)
+
+    return cached('times', size, 0, dt, fill)
+
+
+def nearly_sorted_times(size, seed=DEFAULT_SEED, dt=1.0):
+    """``times`` with one bin in a hundred moved by a few bins."""
+    def fill(out, rng, dt):
+        out[:] = times(size, dt)
+        moved = rng.choice(size, size // 100, replace=False)
+        out[moved] += rng.normal(0, 5 * dt, moved.size)
+
+    return cached('times-nearly-sorted', size, seed, dt, fill)
+
+
+def white_noise(size, seed=DEFAULT_SEED, dt=1.0):
+    """Uniform white noise counts between 0 and 100."""
+    def fill(out, rng, dt):
+        _fill_chunks(out,
+                     lambda start, stop: rng.uniform(0, 100, stop - start))
+
+    return cached('white', size, seed, dt, fill)
+
+
+def leahy_powers(size, seed=DEFAULT_SEED):
+    """
+    Leahy-normalised powers of white noise: chi squared with two degrees of
+    freedom, so exponential with mean 2.
+    """
+    def fill(out, rng, dt):
+        _fill_chunks(out,
+                     lambda start, stop: rng.exponential(2., stop - start))
+
+    return cached('leahy', size, seed, 1.0, fill)
+
+
+def _timmer_koenig(rng, size, dt, spectrum, mean=100., rms=0.3):
+    """
+    Draw Poisson counts around a light curve with the given power spectrum,
+    following Timmer & Koenig (1995).
+    """
+    freq = np.fft.rfftfreq(size, dt)
+    amplitude = np.zeros_like(freq)
+    amplitude[1:] = np.sqrt(spectrum(freq[1:]))
+    ft = (rng.normal(size=freq.size) + 1j * rng.normal(size=freq.size))
+    ft *= amplitude
+    rate = np.fft.irfft(ft, n=size)
+    rate *= rms * mean / max(rate.std(), np.finfo(float).tiny)
+    rate += mean
+    np.clip(rate, 0, None, out=rate)
+    return rng.poisson(rate).astype(np.float64)
+
+
+def red_noise(size, seed=DEFAULT_SEED, dt=1.0, index=2.):
+    """Poisson counts from a power-law (``f**-index``) red noise process."""
+    def fill(out, rng, dt):
+        out[:] = _timmer_koenig(rng, size, dt, lambda f: f**-index)
+
+    return cached('red{:g}'.format(index), size, seed, dt, fill)
+
+
+def qpo(size, seed=DEFAULT_SEED, dt=1.0, freq=0.05, q=10.):
+    """Poisson counts from a Lorentzian QPO at ``freq`` with quality ``q``."""
+    hwhm = freq / (2 * q)
+
+    def fill(out, rng, dt):
+        out[:] = _timmer_koenig(
+            rng, size, dt, lambda f: 1 / (1 + ((f - freq) / hwhm)**2))
+
+    return cached('qpo{:g}q{:g}'.format(freq, q), size, seed, dt, fill)
+
+
+COUNTS = {
+    'white': white_noise,
+    'red': red_noise,
+    'qpo': qpo,
+}
+
+
+def poisson_events(size, seed=DEFAULT_SEED, dt=1.0):
+    """
+    Sorted arrival times of ``size`` photons from a Poisson process with a
+    mean rate of one photon per ``dt``.
+    """
+    def fill(out, rng, dt):
+        offset = 0.
+        for start in range(0, len(out), CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, len(out))
+            chunk = np.cumsum(rng.exponential(dt, stop - start))
+            chunk += offset
+            out[start:stop] = chunk
+            offset = chunk[-1]
+
+    return cached('events', size, seed, dt, fill)
+
+
+def shuffled_events(size, seed=DEFAULT_SEED, dt=1.0):
+    """The ``poisson_events`` arrival times in random order."""
+    def fill(out, rng, dt):
+        out[:] = rng.permutation(poisson_events(size, seed, dt))
+
+    return cached('events-shuffled', size, seed, dt, fill)
+
+
+def event_energies(size, seed=DEFAULT_SEED):
+    """Photon energies in keV, drawn from a power law between 0.3 and 12."""
+    def fill(out, rng, dt):
+        # Inverse transform sampling of a photon index 2 power law.
+        low, high = 0.3, 12.
+        _fill_chunks(out, lambda start, stop: 1 / (
+            1 / low - rng.uniform(size=stop - start) * (1 / low - 1 / high)))
+
+    return cached('energies', size, seed, 1.0, fill)
+
+
+def gapped_gtis(size, seed=DEFAULT_SEED, dt=1.0, n_gaps=10):
+    """
+    Good time intervals covering ``size`` bins of width ``dt``, interrupted
+    by ``n_gaps`` gaps of random length at jittered, roughly even positions,
+    as an ``(n_gaps + 1, 2)`` array. ``size`` must be at least
+    ``4 * (n_gaps + 1)``.
+    """
+    def fill(out, rng, dt):
+        spacing = size // (n_gaps + 1)
+        quarter = max(1, spacing // 4)
+        starts = np.arange(1, n_gaps + 1) * spacing
+        starts += rng.randint(-quarter + 1, quarter, n_gaps)
+        stops = starts + rng.randint(1, quarter + 1, n_gaps)
+        edges = np.concatenate(([0], np.column_stack((starts, stops)).ravel(),
+                                [size])) * dt - dt / 2
+        out[:] = edges.reshape(-1, 2)
+
+    return cached('gti{}'.format(n_gaps), size, seed, dt, fill,
+                  shape=(n_gaps + 1, 2))
+
+
+GTI_PATTERNS = ('orbit', 'dropout')
+
+
+def fragmented_gtis(size, n_intervals, pattern='orbit', seed=DEFAULT_SEED,
+                    dt=1.0):
+    """
+    ``n_intervals`` good time intervals over ``size`` bins of width ``dt``,
+    as an ``(n_intervals, 2)`` array aligned to bin edges.
+
+    ``'orbit'`` repeats a fixed period with the source visible for its first
+    60%, like a low Earth orbit. ``'dropout'`` covers the whole span except
+    for short gaps of 1 to 3 bins at random positions, like telemetry
+    dropouts. A single interval always covers the whole span. ``size`` must
+    be at least ``8 * n_intervals``.
+    """
+    if size < 8 * n_intervals:
+        raise ValueError("{} bins cannot hold {} intervals".format(
+            size, n_intervals))
+
+    def fill(out, rng, dt):
+        period = size // n_intervals
+        if n_intervals == 1:
+            starts, stops = np.array([0]), np.array([size])
+        elif pattern == 'orbit':
+            starts = np.arange(n_intervals) * period
+            stops = starts + max(1, int(0.6 * period))
+        elif pattern == 'dropout':
+            # One gap per period, anywhere in its middle half.
+            gaps = np.arange(1, n_intervals) * period
+            gaps += rng.randint(-(period // 4), period // 4 + 1,
+                                n_intervals - 1)
+            starts = np.concatenate(([0], gaps + rng.randint(
+                1, 4, n_intervals - 1)))
+            stops = np.concatenate((gaps, [size]))
+        else:
+            raise ValueError("Unknown GTI pattern {}".format(pattern))
+        out[:, 0] = starts * dt - dt / 2
+        out[:, 1] = stops * dt - dt / 2
+
+    return cached('gti-{}{}'.format(pattern, n_intervals), size, seed, dt,
+                  fill, shape=(n_intervals, 2))
+
+
+def file_segments(array, segment_size):
+    """
+    Yield consecutive ``segment_size`` chunks of a cached array, read from
+    its file into one reused buffer.
+
+    Unlike slicing the memory map, this never keeps more than one segment
+    resident, so consumers must not hold on to the yielded buffer.
+    """
+    n_segments = array.shape[0] // segment_size
+    buffer = np.empty(segment_size, dtype=array.dtype)
+    with open(array.filename, 'rb') as f_ptr:
+        f_ptr.seek(array.offset)
+        for _ in range(n_segments):
+            f_ptr.readinto(buffer)
+            yield buffer
+
+
+def white_noise_segments(n_segments, segment_size, seed=DEFAULT_SEED):
+    """
+    Yield ``n_segments`` freshly drawn white noise segments, holding the same
+    values as ``white_noise(n_segments * segment_size, seed)``.
+    """
+    rng = np.random.RandomState(seed)
+    for _ in range(n_segments):
+        yield rng.uniform(0, 100, segment_size)
+
+
+def lightcurve(size, kind='white', seed=DEFAULT_SEED, dt=1.0, dtype=None,
+               **kwargs):
+    """
+    Build a ``Lightcurve`` on the cached ``times`` and ``kind`` counts.
+
+    The arrays are read-only memory maps; pass copies to code that writes
+    into them. With ``dtype``, such as ``np.float32``, the counts are
+    instead converted to an in-memory array of that type.
+    """
+    from stingray import Lightcurve
+
+    counts = COUNTS[kind](size, seed, dt)
+    if dtype is not None:
+        counts = counts.astype(dtype)
+    return Lightcurve(times(size, dt), counts, dt=dt, skip_checks=True,
+                      **kwargs)
+
+
+def powerspectrum(n_freq, seed=DEFAULT_SEED):
+    """
+    A Leahy-normalised ``Powerspectrum`` of white noise with ``n_freq``
+    frequencies, filled from ``leahy_powers`` instead of computed from a
+    light curve of ``2 * n_freq + 1`` bins.
+    """
+    from stingray import Powerspectrum
+
+    from .spectral import positive_frequencies
+
+    n_bin = 2 * n_freq + 1
+    pspec = Powerspectrum()
+    pspec.freq = positive_frequencies(n_bin, 1.0)
+    pspec.df = 1. / n_bin
+    pspec.dt = 1.0
+    pspec.n = n_bin
+    pspec.m = 1
+    pspec.norm = 'leahy'
+    pspec.power = np.array(leahy_powers(n_freq, seed))
+    pspec.power_err = pspec.power.copy()
+    pspec.nphots = pspec.nphots1 = 50. * n_bin
+    pspec.unnorm_power = pspec.power * (pspec.nphots / 2)
+    pspec.unnorm_power_err = pspec.power_err * (pspec.nphots / 2)
+    return pspec
+
+
+def crossspectrum(n_freq, seed=DEFAULT_SEED):
+    """
+    An ``AveragedCrossspectrum`` with ``n_freq`` frequencies between two
+    ``powerspectrum`` fixtures with random phases, built without light
+    curves like them.
+    """
+    from stingray import AveragedCrossspectrum
+
+    pds1 = powerspectrum(n_freq, seed)
+    pds2 = powerspectrum(n_freq, seed + 1)
+    # white_noise is uniform between 0 and 100.
+    phase = white_noise(n_freq, seed + 2) * (2 * np.pi / 100.)
+    cs = AveragedCrossspectrum()
+    for attr in ('freq', 'df', 'dt', 'n', 'm', 'norm'):
+        setattr(cs, attr, getattr(pds1, attr))
+    cs.nphots1, cs.nphots2 = pds1.nphots, pds2.nphots
+    cs.nphots = np.sqrt(cs.nphots1 * cs.nphots2)
+    cs.power = np.sqrt(pds1.power * pds2.power) * np.exp(1j * phase)
+    cs.power_err = np.sqrt(pds1.power * pds2.power)
+    cs.unnorm_power = cs.power * (cs.nphots / 2)
+    cs.unnorm_power_err = cs.power_err * (cs.nphots / 2)
+    cs.pds1, cs.pds2 = pds1, pds2
+    return cs
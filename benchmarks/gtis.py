@@ -0,0 +1,95 @@
+"""
+Vectorised GTI masks and splits for heavily fragmented GTIs.
+
+Instead of looping over GTIs, each time is located among the sorted GTI
+starts with one ``searchsorted`` and checked against the stop of the GTI
+it falls in, so the cost is ``O(n log n_gti)`` rather than
+``O(n * n_gti)``. The inclusion rule matches
+``stingray.gti.create_gti_mask``: a bin of width ``dt`` is good if it lies
+entirely inside a GTI, up to ``epsilon * dt``.
+"""
+import numpy as np
+
+
+def _bounds(gtis, dt, epsilon):
+    gtis = np.asarray(gtis, dtype=np.float64)
+    starts = gtis[:, 0] + dt / 2 - epsilon * dt
+    stops = gtis[:, 1] - dt / 2 + epsilon * dt
+    return starts, stops
+
+
+def gti_mask(time, gtis, dt=None, epsilon=0.001):
+    """
+    Boolean mask of the bins of ``time`` that lie within the sorted,
+    non-overlapping ``gtis``.
+
+    ``dt`` defaults to the median bin spacing, as in stingray.
+    """
+    if dt is None:
+        dt = np.median(np.diff(time))
+    starts, stops = _bounds(gtis, dt, epsilon)
+    idx = np.searchsorted(starts, time, side='right') - 1
+    mask = idx >= 0
+    np.clip(idx, 0, None, out=idx)
+    mask &= time <= stops[idx]
+    return mask
+
+
+def gti_slices(time, gtis, dt=None, epsilon=0.001):
+    """
+    Start and stop indices of the good bins of sorted ``time`` in each GTI,
+    as two arrays with one entry per GTI.
+    """
+    if dt is None:
+        dt = np.median(np.diff(time))
+    starts, stops = _bounds(gtis, dt, epsilon)
+    return (np.searchsorted(time, starts, side='left'),
+            np.searchsorted(time, stops, side='right'))
+
+
+def apply_gtis(lc):
+    """Return a new ``Lightcurve`` keeping only the bins of ``lc`` in GTIs."""
+    from stingray import Lightcurve
+
+    mask = gti_mask(lc.time, lc.gti, dt=lc.dt)
+    return Lightcurve(lc.time[mask], lc.counts[mask], err=lc.counts_err[mask],
+                      gti=lc.gti, dt=lc.dt, skip_checks=True)
+
+
+def split_by_gti(lc, min_points=2):
+    """
+    Split ``lc`` into one ``Lightcurve`` per GTI with at least
+    ``min_points`` bins, finding all the boundaries in one pass.
+    """
+    from stingray import Lightcurve
+
+    first, last = gti_slices(lc.time, lc.gti, dt=lc.dt)
+    counts_err = lc.counts_err
+    pieces = []
+    for start, stop, gti in zip(first, last, lc.gti):
+        if stop - start < min_points:
+            continue
+        pieces.append(Lightcurve(lc.time[start:stop], lc.counts[start:stop],
+                                 err=counts_err[start:stop],
+                                 gti=np.array([gti]), dt=lc.dt,
+                                 skip_checks=True))
+    return pieces
+
+
+def join_gtis(gti_list):
+    """
+    Union of all the GTIs in ``gti_list``, like folding
+    ``stingray.gti.join_gtis`` over it: intervals that overlap or touch are
+    merged.
+    """
+    gtis = np.concatenate([np.asarray(gti, dtype=np.float64).reshape(-1, 2)
+                           for gti in gti_list])
+    gtis = gtis[np.argsort(gtis[:, 0], kind='stable')]
+    # Furthest stop reached by any interval so far: an interval opens a new
+    # GTI if it starts past it.
+    reach = np.maximum.accumulate(gtis[:, 1])
+    opens = np.ones(len(gtis), dtype=bool)
+    opens[1:] = gtis[1:, 0] > reach[:-1]
+    first = np.flatnonzero(opens)
+    last = np.append(first[1:] - 1, len(gtis) - 1)
+    return np.stack([gtis[first, 0], reach[last]], axis=1)
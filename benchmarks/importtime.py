@@ -0,0 +1,182 @@
+"""
+Import profiling in fresh interpreters.
+
+Every statement runs in a new ``python -X importtime`` process. The
+per-module self and cumulative times it reports are parsed into a tree,
+and the child reports its own peak memory (``VmHWM``) on exit, so neither
+interpreter startup nor the benchmark process itself is measured.
+"""
+import os
+import subprocess
+import sys
+import time
+
+from . import memory
+
+# Written to stderr right before the profiled statement, so the imports
+# done during interpreter startup can be told apart.
+MARKER = '-- profiled statement --'
+# Prefix of the line with the child's peak resident memory, in kB, written
+# to stderr after the statement. The ru_maxrss from os.wait4 cannot be used
+# on Linux: the child inherits the parent's high-water mark through fork.
+PEAK_MARKER = '-- peak rss kB: '
+_REPORT_PEAK = """
+try:
+    with open('/proc/self/status') as _status:
+        for _line in _status:
+            if _line.startswith('VmHWM:'):
+                sys.stderr.write({!r} + _line.split()[1] + '\\n')
+except OSError:
+    pass
+""".format(PEAK_MARKER)
+
+
+class ImportNode:
+    """
+    One imported module, with its ``self_time`` and ``cumulative`` import
+    times in seconds and the modules it imported first as ``children``.
+    """
+    def __init__(self, name, self_time, cumulative, children=()):
+        self.name = name
+        self.self_time = self_time
+        self.cumulative = cumulative
+        self.children = list(children)
+
+    def walk(self):
+        """Yield this module and everything below it."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(lines):
+    """
+    Parse ``-X importtime`` output into a list of root ``ImportNode``.
+
+    Modules are reported after everything they import, indented by two
+    spaces per level, so each line closes the children collected at the
+    level below it.
+    """
+    pending = {}
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # The column header.
+            continue
+        name = fields[2].rstrip()
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        node = ImportNode(name.strip(), self_us * 1e-6, cumulative_us * 1e-6,
+                          pending.pop(level + 1, ()))
+        pending.setdefault(level, []).append(node)
+    return pending.get(0, [])
+
+
+class ImportProfile:
+    """
+    Result of ``profile_import``: the import tree of ``statement``, the
+    child's peak resident memory ``max_rss`` in bytes (None where neither
+    ``/proc`` nor ``os.wait4`` is available) and the process ``wall_time``.
+    ``own_peak`` is False when ``max_rss`` fell back to ``ru_maxrss``, which
+    may include the parent's peak.
+    """
+    def __init__(self, statement, roots, max_rss, wall_time,
+                 own_peak=True):
+        self.statement = statement
+        self.roots = roots
+        self.max_rss = max_rss
+        self.wall_time = wall_time
+        self.own_peak = own_peak
+
+    def modules(self):
+        """Map of module name to ``ImportNode`` for every imported module."""
+        return {node.name: node
+                for root in self.roots for node in root.walk()}
+
+    def total(self):
+        """Time spent importing, in seconds."""
+        return sum(root.cumulative for root in self.roots)
+
+    def package_time(self, package):
+        """
+        Time spent in the modules of ``package`` itself, wherever in the
+        tree they were imported, leaving out the other packages they pull
+        in.
+        """
+        return sum(node.self_time for node in self.modules().values()
+                   if node.name.split('.')[0] == package)
+
+    def package_cumulative(self, package):
+        """
+        Time spent importing ``package``, including the other packages it
+        pulls in: the cumulative times of its modules that were not
+        imported by another of its modules.
+        """
+        def outermost(node):
+            if node.name.split('.')[0] == package:
+                yield node
+            else:
+                for child in node.children:
+                    yield from outermost(child)
+
+        return sum(node.cumulative for root in self.roots
+                   for node in outermost(root))
+
+    def heaviest(self, n=10, exclude=()):
+        """
+        The ``n`` top-level packages, other than those in ``exclude``, with
+        the largest ``package_cumulative``.
+        """
+        packages = {name.split('.')[0] for name in self.modules()}
+        return sorted(packages.difference(exclude),
+                      key=self.package_cumulative, reverse=True)[:n]
+
+
+def profile_import(statement, setup='pass', executable=sys.executable):
+    """
+    Run ``statement`` in a fresh interpreter and profile its imports.
+
+    ``setup`` runs first, and the imports it does are left out of the
+    profile.
+    """
+    code = ('import sys\n{}\nsys.stderr.write({!r}); sys.stderr.flush()\n'
+            '{}\n{}').format(setup, MARKER + '\n', statement, _REPORT_PEAK)
+    start = time.perf_counter()
+    proc = subprocess.Popen((executable, '-X', 'importtime', '-c', code),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    output = proc.stderr.read()
+    proc.stderr.close()
+    if hasattr(os, 'wait4'):
+        _, status, usage = os.wait4(proc.pid, 0)
+        # The child is reaped already, keep Popen from waiting for it.
+        proc.returncode = status
+        max_rss = memory.maxrss_bytes(usage)
+    else:
+        status = proc.wait()
+        max_rss = None
+    wall_time = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError("{!r} failed:\n{}".format(statement, output))
+
+    lines = output.splitlines()
+    own_peak = False
+    for line in lines:
+        if line.startswith(PEAK_MARKER):
+            # Only fall back to ru_maxrss where /proc is missing.
+            max_rss = int(line[len(PEAK_MARKER):]) * 1024
+            own_peak = True
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    return ImportProfile(statement, parse_importtime(lines), max_rss,
+                         wall_time, own_peak)
+
+
+def best_profile(statement, setup='pass', repeat=3,
+                 executable=sys.executable):
+    """Of ``repeat`` runs, the ``profile_import`` with the lowest total."""
+    return min((profile_import(statement, setup, executable)
+                for _ in range(repeat)), key=ImportProfile.total)
@@ -0,0 +1,42 @@
+"""
+In-place ``Lightcurve`` arithmetic.
+
+``iadd`` and ``isub`` write the result into the counts and error arrays of
+the first light curve, so accumulating many light curves allocates nothing
+per step. Like ``+=``, they return the light curve to keep; light curves
+with different GTIs fall back to the regular operators, which cross the
+GTIs.
+"""
+import numpy as np
+
+from . import binindex
+
+
+def _inplace(lc, other, operation):
+    if lc.time is not other.time and not np.array_equal(lc.time,
+                                                        other.time):
+        raise ValueError("The light curves have different times")
+    if not np.array_equal(lc.gti, other.gti):
+        return None
+    counts = lc.counts
+    counts_err = lc.counts_err
+    operation(counts, other.counts, out=counts)
+    np.hypot(counts_err, other.counts_err, out=counts_err)
+    # Reassign, so that derived quantities are recomputed.
+    lc.counts = counts
+    lc.counts_err = counts_err
+    # The arrays are the same objects, so a cached index would look valid.
+    binindex.invalidate(lc)
+    return lc
+
+
+def iadd(lc, other):
+    """Add ``other`` to ``lc`` in place, like ``lc += other``."""
+    result = _inplace(lc, other, np.add)
+    return lc + other if result is None else result
+
+
+def isub(lc, other):
+    """Subtract ``other`` from ``lc`` in place, like ``lc -= other``."""
+    result = _inplace(lc, other, np.subtract)
+    return lc - other if result is None else result
@@ -0,0 +1,135 @@
+"""
+Lazy loading of the stingray package, for short-lived processes.
+
+``install`` registers the ``stingray`` package without running its
+``__init__``, which imports every submodule. Public names are then resolved
+on first access through a module ``__getattr__`` (PEP 562) that imports only
+the submodule defining them; names it does not know fall back to running
+the real ``__init__``. Heavy modules such as ``matplotlib.pyplot`` can also
+be replaced by placeholders that import them on first attribute access.
+
+This file imports nothing from the benchmark package, so a fresh
+interpreter can load it with ``runpy.run_path`` before importing stingray.
+"""
+import importlib
+import importlib.machinery
+import importlib.util
+import sys
+import types
+
+# Public stingray names and the submodules that define them.
+STINGRAY_ATTRIBUTES = {
+    'StingrayObject': 'base',
+    'StingrayTimeseries': 'base',
+    'EventList': 'events',
+    'Lightcurve': 'lightcurve',
+    'Powerspectrum': 'powerspectrum',
+    'AveragedPowerspectrum': 'powerspectrum',
+    'DynamicalPowerspectrum': 'powerspectrum',
+    'Crossspectrum': 'crossspectrum',
+    'AveragedCrossspectrum': 'crossspectrum',
+    'DynamicalCrossspectrum': 'crossspectrum',
+    'Covariancespectrum': 'covariancespectrum',
+    'AveragedCovariancespectrum': 'covariancespectrum',
+    'CrossCorrelation': 'crosscorrelation',
+    'AutoCorrelation': 'crosscorrelation',
+    'Bispectrum': 'bispectrum',
+    'Multitaper': 'multitaper',
+    'LombScarglePowerspectrum': 'lombscargle',
+    'LombScargleCrossspectrum': 'lombscargle',
+}
+
+# Only modules used through attribute access can wait: stingray imports
+# names from numba and applies its decorators at import time, so numba is
+# needed as soon as stingray.utils loads.
+DEFERRED_MODULES = ('matplotlib', 'matplotlib.pyplot')
+
+
+class DeferredModule(types.ModuleType):
+    """
+    Placeholder that imports the module it stands for on the first access
+    to an attribute it does not have, and delegates to it from then on.
+    """
+    def __getattr__(self, attr):
+        module = self.__dict__.get('_module')
+        if module is None:
+            name = self.__name__
+            if sys.modules.get(name) is self:
+                del sys.modules[name]
+            module = importlib.import_module(name)
+            self.__dict__['_module'] = module
+        return getattr(module, attr)
+
+
+def _find_spec(name):
+    """Find the spec of module ``name`` without importing its parents."""
+    parent = name.rpartition('.')[0]
+    if not parent:
+        return importlib.util.find_spec(name)
+    parent_spec = _find_spec(parent)
+    if parent_spec is None or parent_spec.submodule_search_locations is None:
+        return None
+    return importlib.machinery.PathFinder.find_spec(
+        name, parent_spec.submodule_search_locations)
+
+
+def defer_modules(names):
+    """
+    Put a ``DeferredModule`` in ``sys.modules`` for each of ``names`` that
+    is installed and not imported yet. Placeholders for submodules are also
+    set as attributes of their parent's placeholder, so
+    ``import package.module as name`` does not load the parent either.
+    """
+    # Look everything up first: placeholders have no spec to search.
+    names = [name for name in names
+             if name not in sys.modules and _find_spec(name) is not None]
+    for name in names:
+        sys.modules[name] = DeferredModule(name)
+        parent, _, child = name.rpartition('.')
+        if parent and isinstance(sys.modules.get(parent), DeferredModule):
+            sys.modules[parent].__dict__[child] = sys.modules[name]
+
+
+def install(package='stingray', attributes=None, deferred=DEFERRED_MODULES):
+    """
+    Register ``package`` for lazy loading and defer the ``deferred``
+    modules. Must run before anything imports ``package``.
+
+    Returns the package module.
+    """
+    if package in sys.modules:
+        raise RuntimeError("{} is already imported".format(package))
+    if attributes is None:
+        attributes = STINGRAY_ATTRIBUTES
+    spec = importlib.util.find_spec(package)
+    if spec is None:
+        raise ImportError("No module named {!r}".format(package))
+    module = importlib.util.module_from_spec(spec)
+
+    def __getattr__(name):
+        if name in attributes:
+            submodule = importlib.import_module(
+                '{}.{}'.format(package, attributes[name]))
+            value = getattr(submodule, name)
+        elif not name.startswith('__') and importlib.util.find_spec(
+                '{}.{}'.format(package, name)) is not None:
+            value = importlib.import_module('{}.{}'.format(package, name))
+        elif not module.__dict__.get('_eager'):
+            # Anything else may be set up by the package itself.
+            module.__dict__['_eager'] = True
+            spec.loader.exec_module(module)
+            return getattr(module, name)
+        else:
+            raise AttributeError("module {!r} has no attribute {!r}".format(
+                package, name))
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attributes))
+
+    module.__getattr__ = __getattr__
+    module.__dir__ = __dir__
+    defer_modules(deferred)
+    sys.modules[package] = module
+    return module
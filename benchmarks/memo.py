@@ -0,0 +1,71 @@
+"""
+Memoised derived products of power and cross spectra.
+
+``derived(spectrum, 'coherence')`` calls ``spectrum.coherence()`` once and
+returns the stored result on later calls, as long as the spectrum's
+``power``, ``freq``, ``norm`` and ``m`` are unchanged. The cache lives on
+the instance, so it goes away with the spectrum.
+
+Arrays are tracked by identity: replacing ``power`` drops the cache, but
+editing it in place does not, so call ``invalidate`` after such edits. The
+spectrum's own arrays are left writable. Results are returned as read-only
+views, so that callers cannot change the cached values; copy them before
+modifying.
+"""
+import numpy as np
+
+# Name of the instance attribute holding the cache.
+ATTRIBUTE = '_derived_cache'
+
+TRACKED = ('power', 'freq', 'norm', 'm')
+
+
+def _same(value1, value2):
+    if value1 is value2:
+        return True
+    if isinstance(value1, np.ndarray) or isinstance(value2, np.ndarray):
+        return False
+    return value1 == value2
+
+
+def _read_only(value):
+    """``value`` with its arrays replaced by read-only views."""
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        value = tuple(_read_only(item) for item in value)
+    return value
+
+
+def _cache(spectrum):
+    state = tuple(getattr(spectrum, name, None) for name in TRACKED)
+    cache = spectrum.__dict__.get(ATTRIBUTE)
+    if cache is None or not all(map(_same, cache[0], state)):
+        cache = (state, {})
+        setattr(spectrum, ATTRIBUTE, cache)
+    return cache[1]
+
+
+def derived(spectrum, name, *args, **kwargs):
+    """
+    ``getattr(spectrum, name)(*args, **kwargs)``, computed once for each
+    state of the spectrum and set of (hashable) arguments.
+    """
+    results = _cache(spectrum)
+    key = (name, args, tuple(sorted(kwargs.items())))
+    try:
+        return _read_only(results[key])
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable arguments: nothing to look up.
+        return getattr(spectrum, name)(*args, **kwargs)
+    result = getattr(spectrum, name)(*args, **kwargs)
+    results[key] = result
+    return _read_only(result)
+
+
+def invalidate(spectrum):
+    """Drop the cached products of ``spectrum``."""
+    spectrum.__dict__.pop(ATTRIBUTE, None)
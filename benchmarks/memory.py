@@ -0,0 +1,13 @@
+"""
+Resident memory reported by ``getrusage``, for ``track_*`` benchmarks that
+need more than the single peak value asv's ``peakmem_*`` reports.
+"""
+import sys
+
+
+def maxrss_bytes(usage):
+    """Peak resident set size of a ``resource.struct_rusage`` in bytes."""
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else.
+    if sys.platform == 'darwin':
+        return usage.ru_maxrss
+    return usage.ru_maxrss * 1024
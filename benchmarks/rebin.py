@@ -0,0 +1,206 @@
+"""
+Vectorised linear and logarithmic rebinning of power and cross spectra.
+
+The bins are worked out once per call, as start indices into the
+frequency array, and every array of the spectrum (powers, errors,
+unnormalised powers and the power spectra of a cross spectrum) is then
+accumulated with ``np.add.reduceat`` on the same indices. The results
+follow ``Crossspectrum.rebin`` and ``Crossspectrum.rebin_log``:
+
+* linear bins may split old bins, which then contribute the fraction of
+  their width that falls in each new bin (squared for the variances);
+* logarithmic bins start at half the first frequency with the original
+  resolution and grow by a factor ``1 + f``; their edges are the partial
+  sums of a geometric series, computed in closed form.
+"""
+import copy
+
+import numpy as np
+
+MEAN_METHODS = ('mean', 'avg', 'average', 'arithmetic mean')
+
+
+class LinearBins:
+    """
+    Rebinning of ``n_old`` evenly spaced bins into bins ``factor >= 1``
+    times as wide. Trailing old bins that do not fill a new bin are
+    dropped.
+
+    New bin edges are placed exactly at multiples of ``factor``, where
+    ``rebin_data`` compares floating point frequencies and may count an
+    old bin twice when an edge lands on it, as happens for ``f=1``.
+    """
+    def __init__(self, n_old, factor, n_new=None):
+        if factor < 1:
+            raise ValueError("New frequency resolution must be larger than "
+                             "old frequency resolution.")
+        self.factor = factor
+        if n_new is None:
+            n_new = int(n_old / factor)
+        # Edges of the new bins in units of old bins, and the first old bin
+        # starting at or after each of them.
+        edges = np.arange(n_new + 1) * factor
+        self.first = np.minimum(np.ceil(edges).astype(np.intp), n_old)
+        # Fraction of the old bin before each first bin lying past the edge.
+        self.weight = self.first - edges
+        self.fractional = bool(np.any(self.weight > 1e-9))
+
+    def _reduce(self, values):
+        return np.add.reduceat(values[:self.first[-1]], self.first[:-1])
+
+    def sum(self, values):
+        """Sum of ``values`` in each new bin."""
+        out = self._reduce(values)
+        if self.fractional:
+            # Each new bin takes the tail of the old bin split at its left
+            # edge and gives back the tail of the one split at its right.
+            split = values[self.first - 1] * self.weight
+            out += split[:-1]
+            out -= split[1:]
+        return out
+
+    def root_sum_squares(self, err):
+        """
+        Errors of the sums of ``values`` with errors ``err``. Complex errors
+        are squared as complex numbers, as in ``rebin_data``.
+        """
+        squares = err * err
+        out = self._reduce(squares)
+        if self.fractional:
+            split = squares[self.first - 1]
+            out += split[:-1] * self.weight[:-1]**2
+            out -= split[1:] * (1 - (1 - self.weight[1:])**2)
+        return np.sqrt(out)
+
+    def rebin(self, values, err=None, method='mean'):
+        """Rebinned ``values`` and ``err``, summed or averaged."""
+        out = self.sum(values)
+        out_err = None if err is None else self.root_sum_squares(err)
+        if method in MEAN_METHODS:
+            out /= self.factor
+            if out_err is not None:
+                out_err /= self.factor
+        elif method != 'sum':
+            raise ValueError("Method for summing or averaging not "
+                             "recognized. Please enter either 'sum' or "
+                             "'mean'.")
+        return out, out_err
+
+
+def log_edges(first_freq, last_freq, df, f):
+    """
+    Edges of logarithmic bins from ``first_freq / 2`` past ``last_freq``,
+    the first ``df`` wide and each ``1 + f`` times wider than the previous.
+    """
+    start = first_freq * 0.5
+    # Edge j lies at start + df * ((1 + f)**j - 1) / f.
+    n_bins = int(np.log1p(f * (last_freq - start) / df) / np.log1p(f)) + 1
+    edges = start + df * np.expm1(np.arange(n_bins + 2) * np.log1p(f)) / f
+    # Keep exactly one edge past the last frequency.
+    return edges[:np.searchsorted(edges, last_freq, side='right') + 1]
+
+
+class LogBins:
+    """
+    Logarithmic rebinning of the frequencies ``freq`` with resolution
+    ``df``. All bins are at least ``df`` wide, so none is empty.
+    """
+    def __init__(self, freq, df, f):
+        edges = log_edges(freq[0], freq[-1], df, f)
+        self.starts = np.searchsorted(freq, edges[:-1], side='left')
+        self.nsamples = np.diff(np.append(self.starts, freq.size))
+
+    def mean(self, values):
+        """Mean of ``values`` in each new bin."""
+        return np.add.reduceat(values, self.starts) / self.nsamples
+
+    def root_squared_mean(self, err):
+        """Errors of the means of ``values`` with errors ``err``."""
+        if np.iscomplexobj(err):
+            return (self.root_squared_mean(err.real) +
+                    1j * self.root_squared_mean(err.imag))
+        return np.sqrt(np.add.reduceat(err * err, self.starts)) / \
+            self.nsamples
+
+    def rebin(self, values, err=None):
+        """Rebinned ``values`` and ``err``."""
+        return self.mean(values), \
+            None if err is None else self.root_squared_mean(err)
+
+
+def _unnorm(spectrum):
+    return (getattr(spectrum, 'unnorm_power', None),
+            getattr(spectrum, 'unnorm_power_err', None))
+
+
+def _linear(spectrum, bins, df, method):
+    from stingray import Powerspectrum
+
+    new_spec = copy.copy(spectrum)
+    new_spec.power, new_spec.power_err = bins.rebin(
+        spectrum.power, spectrum.power_err, method)
+    unnorm_power, unnorm_power_err = _unnorm(spectrum)
+    if unnorm_power is not None:
+        new_spec.unnorm_power, binned_err = bins.rebin(
+            unnorm_power, unnorm_power_err, method)
+        if unnorm_power_err is not None:
+            new_spec.unnorm_power_err = binned_err
+    if hasattr(spectrum, 'cs_all'):
+        new_spec.cs_all = [bins.rebin(cs, method=method)[0]
+                           for cs in spectrum.cs_all]
+    for name in ('pds1', 'pds2'):
+        if hasattr(spectrum, name):
+            setattr(new_spec, name,
+                    _linear(getattr(spectrum, name), bins, df, method))
+    if isinstance(spectrum, Powerspectrum):
+        new_spec.nphots = spectrum.nphots1
+    new_spec.freq = spectrum.freq[0] - 0.5 * spectrum.df + 0.5 * df + \
+        np.arange(new_spec.power.size) * df
+    new_spec.df = df
+    new_spec.m = np.rint(bins.factor * spectrum.m)
+    return new_spec
+
+
+def rebin(spectrum, df=None, f=None, method='mean'):
+    """
+    Like ``spectrum.rebin(df=df, f=f, method=method)`` for a power or cross
+    spectrum with evenly spaced frequencies.
+    """
+    if f is None and df is None:
+        raise ValueError("You need to specify at least one between f and df")
+    elif f is not None:
+        df = f * spectrum.df
+    freq = spectrum.freq
+    # Count the new bins from the frequencies like rebin_data, which drops
+    # the last bin when rounding leaves the span just short of it.
+    n_new = int((freq[-1] - freq[0] + spectrum.df) / df)
+    bins = LinearBins(freq.size, df / spectrum.df, n_new)
+    return _linear(spectrum, bins, df, method)
+
+
+def _log(spectrum, bins, freq):
+    new_spec = copy.copy(spectrum)
+    new_spec.freq = freq
+    new_spec.power, new_spec.power_err = bins.rebin(spectrum.power,
+                                                    spectrum.power_err)
+    new_spec.m = bins.nsamples * spectrum.m
+    new_spec.k = bins.nsamples
+    unnorm_power, unnorm_power_err = _unnorm(spectrum)
+    if unnorm_power is not None:
+        new_spec.unnorm_power, binned_err = bins.rebin(unnorm_power,
+                                                       unnorm_power_err)
+        if unnorm_power_err is not None:
+            new_spec.unnorm_power_err = binned_err
+    for name in ('pds1', 'pds2'):
+        if hasattr(spectrum, name):
+            setattr(new_spec, name,
+                    _log(getattr(spectrum, name), bins, freq))
+    if hasattr(spectrum, 'cs_all'):
+        new_spec.cs_all = [bins.mean(cs) for cs in spectrum.cs_all]
+    return new_spec
+
+
+def rebin_log(spectrum, f=0.01):
+    """Like ``spectrum.rebin_log(f)`` for a power or cross spectrum."""
+    bins = LogBins(spectrum.freq, spectrum.df, f)
+    return _log(spectrum, bins, bins.mean(spectrum.freq))
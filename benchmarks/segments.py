@@ -0,0 +1,112 @@
+"""
+Segment lengths for FFT-length sensitivity sweeps.
+
+FFT cost per bin is far from smooth in the transform length: powers of two
+are fastest, other 5-smooth lengths (only factors 2, 3 and 5) come close,
+and primes fall back to much slower algorithms. The sweep samples all three
+families around a few octaves between 128 and 2**20 bins, never above
+2**20.
+"""
+import time
+
+import numpy as np
+
+SWEEP_OCTAVES = (7, 10, 13, 16, 20)
+MAX_SWEEP_SIZE = 2**max(SWEEP_OCTAVES)
+
+
+def is_5_smooth(n):
+    """Whether ``n`` has no prime factors other than 2, 3 and 5."""
+    for factor in (2, 3, 5):
+        while n % factor == 0:
+            n //= factor
+    return n == 1
+
+
+def five_smooth(lower, upper):
+    """Sorted 5-smooth integers between ``lower`` and ``upper``."""
+    sizes = []
+    p2 = 1
+    while p2 <= upper:
+        p3 = p2
+        while p3 <= upper:
+            p5 = p3
+            while p5 <= upper:
+                if p5 >= lower:
+                    sizes.append(p5)
+                p5 *= 5
+            p3 *= 3
+        p2 *= 2
+    return sorted(sizes)
+
+
+def next_fast_len(n):
+    """Smallest 5-smooth integer not less than ``n``."""
+    while not is_5_smooth(n):
+        n += 1
+    return n
+
+
+def prev_fast_len(n):
+    """Largest 5-smooth integer not greater than ``n``."""
+    while not is_5_smooth(n):
+        n -= 1
+    return n
+
+
+def is_prime(n):
+    if n < 2:
+        return False
+    return all(n % d for d in range(2, int(n**0.5) + 1))
+
+
+def next_prime(n):
+    """Smallest prime not less than ``n``."""
+    while not is_prime(n):
+        n += 1
+    return n
+
+
+def prev_prime(n):
+    """Largest prime not greater than ``n``."""
+    while not is_prime(n):
+        n -= 1
+    return n
+
+
+def sweep_sizes():
+    """
+    Segment lengths of the sweep: for every octave ``k`` in
+    ``SWEEP_OCTAVES``, ``2**k`` and the next 5-smooth and prime lengths
+    above it, or below it where those would exceed ``MAX_SWEEP_SIZE``.
+    """
+    sizes = []
+    for k in SWEEP_OCTAVES:
+        fast, prime = next_fast_len(2**k + 1), next_prime(2**k + 1)
+        if max(fast, prime) > MAX_SWEEP_SIZE:
+            fast, prime = prev_fast_len(2**k - 1), prev_prime(2**k - 1)
+        sizes += [2**k, fast, prime]
+    return sizes
+
+
+def fft_cost(n, repeat=5):
+    """Best-of-``repeat`` time of one real FFT of ``n`` bins, per bin."""
+    data = np.random.RandomState(n).uniform(0, 100, n)
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        np.fft.rfft(data)
+        best = min(best, time.perf_counter() - start)
+    return best / n
+
+
+def optimal_segment_size(lower, upper, repeat=5):
+    """
+    Return the 5-smooth segment length between ``lower`` and ``upper`` with
+    the lowest measured FFT cost per bin on this machine.
+    """
+    candidates = five_smooth(lower, upper)
+    if not candidates:
+        raise ValueError("No 5-smooth length between {} and {}".format(
+            lower, upper))
+    return min(candidates, key=lambda n: fft_cost(n, repeat))
@@ -0,0 +1,79 @@
+"""
+Sorting light curves that are already, or almost, in order.
+
+``Lightcurve.sort`` and ``sort_counts`` always run a full ``np.argsort``
+and rebuild the light curve through ``apply_mask``. ``sort_order`` first
+counts the places where the values step backwards, in one O(n) pass:
+
+* none at all means the values are already sorted, and nothing is sorted
+  or gathered;
+* a few, leaving runs ``MIN_RUN`` values long on average, means the values
+  are sorted in runs or nearly sorted, and numpy's stable sort (timsort
+  for floating point values) merges the runs far faster than quicksort;
+* otherwise the default quicksort is used.
+
+``sort`` and ``sort_counts`` then gather every array of the light curve
+with the one permutation, where ``apply_mask`` also deep-copies each
+gathered array.
+"""
+import copy
+
+import numpy as np
+
+# Mean length of the sorted runs from which the stable sort is faster.
+MIN_RUN = 32
+
+
+def sort_order(values, reverse=False):
+    """
+    Permutation sorting ``values`` in increasing (or, with ``reverse``,
+    decreasing) order, or ``None`` if they already are.
+    """
+    values = np.asarray(values)
+    if reverse:
+        breaks = np.count_nonzero(values[1:] > values[:-1])
+    else:
+        breaks = np.count_nonzero(values[1:] < values[:-1])
+    if breaks == 0:
+        return None
+    kind = 'stable' if (breaks + 1) * MIN_RUN <= values.size else None
+    order = np.argsort(values, kind=kind)
+    # Reversed after sorting, as in stingray.
+    return order[::-1] if reverse else order
+
+
+def _apply_order(lc, order, inplace):
+    """
+    Reorder all the arrays of ``lc`` by ``order``, copying them if it is
+    ``None``, like ``lc.apply_mask(order, inplace)`` without copying the
+    gathered arrays once more.
+    """
+    if inplace:
+        if order is None:
+            return lc
+        new_lc = lc
+    else:
+        new_lc = type(lc)()
+        for attr in lc.meta_attrs():
+            setattr(new_lc, attr, copy.deepcopy(getattr(lc, attr)))
+    main = lc.main_array_attr
+    if hasattr(lc, '_' + main):
+        main = '_' + main
+    for attr in [main] + lc.internal_array_attrs() + lc.array_attrs():
+        values = np.asanyarray(getattr(lc, attr))
+        setattr(new_lc, attr,
+                values.copy() if order is None else values[order])
+    return new_lc
+
+
+def sort(lc, reverse=False, inplace=False):
+    """Like ``lc.sort(reverse, inplace)``, skipping sorted light curves."""
+    return _apply_order(lc, sort_order(lc.time, reverse), inplace)
+
+
+def sort_counts(lc, reverse=False, inplace=False):
+    """
+    Like ``lc.sort_counts(reverse, inplace)``, skipping light curves
+    already sorted by counts.
+    """
+    return _apply_order(lc, sort_order(lc.counts, reverse), inplace)
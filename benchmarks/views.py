@@ -0,0 +1,86 @@
+"""
+Splitting light curves into pieces that share the parent's memory.
+
+``Lightcurve.split`` and ``Lightcurve.split_by_gti`` build every piece
+with a boolean mask over the whole light curve, copying its arrays (and
+scanning all of them once per GTI). The functions here find the piece
+boundaries with one ``searchsorted`` pass and return light curves holding
+slices of the parent's ``time``, ``counts`` and (if already computed)
+``counts_err``, so splitting allocates no array memory at all.
+
+The slices are made read-only, so that writing to a piece cannot silently
+change the parent or its other pieces. Call ``writable`` on a piece to get
+a copy that can be modified.
+"""
+import numpy as np
+
+from . import gtis
+
+
+def _view(array, window):
+    view = array[window]
+    view.flags.writeable = False
+    return view
+
+
+def _piece(lc, start, stop, gti):
+    from stingray import Lightcurve
+
+    window = slice(start, stop)
+    # The public counts_err computes Poisson errors for every bin on first
+    # access; the private attribute is None until then, so errors are only
+    # sliced if they already exist.
+    err = lc._counts_err
+    return Lightcurve(_view(lc.time, window), _view(lc.counts, window),
+                      err=None if err is None else _view(err, window),
+                      gti=np.array([gti]), dt=lc.dt, err_dist=lc.err_dist,
+                      mjdref=lc.mjdref, skip_checks=True)
+
+
+def split_by_gti(lc, gti=None, min_points=2):
+    """
+    Like ``lc.split_by_gti(gti, min_points)``, with pieces holding
+    read-only views of the arrays of ``lc``.
+    """
+    if gti is None:
+        gti = lc.gti
+    gti = np.asarray(gti)
+    # As in stingray: pieces with too few bins of width dt are skipped, but
+    # the bins kept are those inside each GTI for the median time spacing,
+    # which drops edge bins when the bins are spaced wider than dt.
+    first, last = gtis.gti_slices(lc.time, gti, dt=lc.dt)
+    start, stop = gtis.gti_slices(lc.time, gti)
+    return [_piece(lc, start[i], stop[i], gti[i])
+            for i in np.flatnonzero(last - first >= min_points)]
+
+
+def split(lc, min_gap, min_points=1):
+    """
+    Like ``lc.split(min_gap, min_points)``, with pieces holding read-only
+    views of the arrays of ``lc``.
+    """
+    from stingray.gti import cross_two_gtis
+
+    time = lc.time
+    tdiff = np.diff(time)
+    gap = np.flatnonzero(tdiff >= min_gap)
+    # Same tolerance around the contiguous stretches as stingray.
+    epsilon = np.min(tdiff) / 2.0
+    gti = np.stack([np.append(time[0], time[gap + 1]) - epsilon,
+                    np.append(time[gap], time[-1]) + epsilon], axis=1)
+    if lc.gti is not None:
+        gti = cross_two_gtis(lc.gti, gti)
+    return split_by_gti(lc, gti, min_points=min_points)
+
+
+def writable(piece):
+    """A copy of ``piece`` with its own, writable arrays."""
+    from stingray import Lightcurve
+
+    # As in _piece, copy errors only if they were computed.
+    err = piece._counts_err
+    return Lightcurve(piece.time.copy(), piece.counts.copy(),
+                      err=None if err is None else err.copy(),
+                      gti=piece.gti.copy(), dt=piece.dt,
+                      err_dist=piece.err_dist, mjdref=piece.mjdref,
+                      skip_checks=True)
@@ -0,0 +1,42 @@
+"""Tests of ``benchmarks.batch``."""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from benchmarks.batch import LightcurveBatch  # noqa: E402
+
+
+class TestRebin(unittest.TestCase):
+    def setUp(self):
+        self.time = np.arange(10.)
+        self.counts = np.arange(30).reshape(3, 10)
+
+    def test_sum(self):
+        rebinned = LightcurveBatch(self.time, self.counts, 1.0).rebin(4.0)
+        np.testing.assert_array_equal(rebinned.counts,
+                                      [[6, 22], [46, 62], [86, 102]])
+        np.testing.assert_array_equal(rebinned.time, [1.5, 5.5])
+
+    def test_mean_of_integer_counts(self):
+        batch = LightcurveBatch(self.time, self.counts, 1.0)
+        rebinned = batch.rebin(4.0, method='mean')
+        np.testing.assert_allclose(rebinned.counts,
+                                   [[1.5, 5.5], [11.5, 15.5], [21.5, 25.5]])
+        np.testing.assert_allclose(
+            rebinned.counts_err,
+            np.sqrt((batch.counts_err[:, :8]**2).reshape(3, 2, 4).sum(-1))
+            / 4)
+
+    def test_bad_dt(self):
+        batch = LightcurveBatch(self.time, self.counts, 1.0)
+        with self.assertRaises(ValueError):
+            batch.rebin(2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Tests of ``benchmarks.binindex`` against ``Lightcurve.rebin``."""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+try:
+    from stingray import Lightcurve
+except ImportError:
+    Lightcurve = None
+
+from benchmarks import binindex, inplace  # noqa: E402
+
+
+@unittest.skipIf(Lightcurve is None, "stingray not installed")
+class TestRebin(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.time = np.arange(1000.)
+        self.lc = Lightcurve(self.time, rng.poisson(100, 1000).astype(float),
+                             dt=1.0, skip_checks=True)
+        self.other = Lightcurve(self.time,
+                                rng.poisson(50, 1000).astype(float),
+                                dt=1.0, skip_checks=True)
+
+    def assertSameRebin(self, lc, dt_new, method='sum'):
+        rebinned = binindex.rebin(lc, dt_new, method=method)
+        expected = lc.rebin(dt_new, method=method)
+        np.testing.assert_allclose(rebinned.time, expected.time)
+        np.testing.assert_allclose(rebinned.counts, expected.counts)
+        np.testing.assert_allclose(rebinned.counts_err, expected.counts_err)
+
+    def test_rebin(self):
+        for dt_new in (2.0, 7.0, 100.0):
+            for method in ('sum', 'mean'):
+                self.assertSameRebin(self.lc, dt_new, method)
+
+    def test_cached(self):
+        index = binindex.rebin_index(self.lc)
+        self.assertIs(binindex.rebin_index(self.lc), index)
+
+    def test_replaced_arrays(self):
+        binindex.rebin(self.lc, 4.0)
+        self.lc.counts = self.lc.counts * 2
+        self.assertSameRebin(self.lc, 4.0)
+        self.lc.counts_err = self.lc.counts_err * 2
+        self.assertSameRebin(self.lc, 4.0)
+
+    def test_inplace_writes(self):
+        binindex.rebin(self.lc, 4.0)
+        lc = inplace.iadd(self.lc, self.other)
+        self.assertSameRebin(lc, 4.0)
+        lc = inplace.isub(lc, self.other)
+        self.assertSameRebin(lc, 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Tests of ``benchmarks.memo``."""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from benchmarks import memo  # noqa: E402
+
+
+class Spectrum:
+    """Stand-in for a spectrum, counting the products it computes."""
+    def __init__(self):
+        self.freq = np.arange(1., 11.)
+        self.power = np.ones(10)
+        self.norm = 'leahy'
+        self.m = 1
+        self.calls = 0
+
+    def doubled(self, factor=2):
+        self.calls += 1
+        return factor * self.power
+
+    def own_power(self):
+        self.calls += 1
+        return self.power
+
+
+class TestDerived(unittest.TestCase):
+    def setUp(self):
+        self.spectrum = Spectrum()
+
+    def test_cached(self):
+        first = memo.derived(self.spectrum, 'doubled')
+        second = memo.derived(self.spectrum, 'doubled')
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(self.spectrum.calls, 1)
+        memo.derived(self.spectrum, 'doubled', factor=3)
+        self.assertEqual(self.spectrum.calls, 2)
+
+    def test_spectrum_stays_writable(self):
+        memo.derived(self.spectrum, 'doubled')
+        memo.derived(self.spectrum, 'own_power')
+        self.spectrum.power[0] = 5.
+        self.spectrum.freq[0] = 5.
+
+    def test_results_read_only(self):
+        result = memo.derived(self.spectrum, 'doubled')
+        with self.assertRaises(ValueError):
+            result[0] = 0.
+        np.testing.assert_array_equal(memo.derived(self.spectrum, 'doubled'),
+                                      2.)
+
+    def test_replaced_power(self):
+        memo.derived(self.spectrum, 'doubled')
+        self.spectrum.power = np.full(10, 2.)
+        np.testing.assert_array_equal(memo.derived(self.spectrum, 'doubled'),
+                                      4.)
+
+    def test_invalidate(self):
+        memo.derived(self.spectrum, 'doubled')
+        self.spectrum.power *= 2
+        memo.invalidate(self.spectrum)
+        np.testing.assert_array_equal(memo.derived(self.spectrum, 'doubled'),
+                                      4.)
+
+
+if __name__ == '__main__':
+    unittest.main()
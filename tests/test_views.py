@@ -0,0 +1,75 @@
+"""Tests of ``benchmarks.views`` against the ``Lightcurve`` methods."""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+try:
+    from stingray import Lightcurve
+except ImportError:
+    Lightcurve = None
+
+from benchmarks import views  # noqa: E402
+
+
+@unittest.skipIf(Lightcurve is None, "stingray not installed")
+class TestSplit(unittest.TestCase):
+    def assertSamePieces(self, pieces, expected):
+        self.assertEqual(len(pieces), len(expected))
+        for piece, lc in zip(pieces, expected):
+            np.testing.assert_array_equal(piece.time, lc.time)
+            np.testing.assert_array_equal(piece.counts, lc.counts)
+            np.testing.assert_array_equal(piece.counts_err, lc.counts_err)
+            np.testing.assert_array_equal(piece.gti, lc.gti)
+
+    def lightcurve(self, time, dt=1.0):
+        counts = np.random.RandomState(0).poisson(100, time.size)
+        return Lightcurve(time, counts, dt=dt, skip_checks=True)
+
+    def test_gaps(self):
+        time = np.arange(1000.) + 10.0 * (np.arange(1000) // 100)
+        lc = self.lightcurve(time)
+        pieces = views.split(lc, 4)
+        self.assertEqual(len(pieces), 10)
+        self.assertSamePieces(pieces, lc.split(4))
+
+    def test_uneven_gaps(self):
+        time = np.arange(100.)
+        time[30:] += 5
+        time[31:] += 3
+        time[70:] += 20
+        lc = self.lightcurve(time)
+        for min_points in (1, 2, 5):
+            self.assertSamePieces(views.split(lc, 4, min_points),
+                                  lc.split(4, min_points))
+
+    def test_bins_wider_than_dt(self):
+        # Stingray keeps the bins inside the GTIs for the time spacing, so
+        # it drops the edge bins here.
+        lc = self.lightcurve(np.arange(0., 996., 6.))
+        self.assertSamePieces(views.split(lc, 4), lc.split(4))
+
+    def test_split_by_gti(self):
+        lc = self.lightcurve(np.arange(1000.))
+        lc.gti = np.array([[-0.5, 99.5], [200.5, 201.5], [300.5, 699.5]])
+        for min_points in (1, 2):
+            self.assertSamePieces(
+                views.split_by_gti(lc, min_points=min_points),
+                lc.split_by_gti(min_points=min_points))
+
+    def test_read_only(self):
+        lc = self.lightcurve(np.arange(100.))
+        piece = views.split_by_gti(lc)[0]
+        with self.assertRaises(ValueError):
+            piece.counts[0] = 0
+        copy = views.writable(piece)
+        copy.counts[0] = 0
+        self.assertNotEqual(lc.counts[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,341 @@
+"""
+Offline performance regression gate over two asv result sets.
+
+Compares every ``time_*`` and ``peakmem_*`` benchmark of a head result set
+against a base one, such as two commits or the same commit in two
+environments. When asv recorded the raw samples (``asv run
+--record-samples``) a benchmark only counts as slower if a two-sided
+Mann-Whitney U test rejects equal distributions, the bootstrap confidence
+interval of the ratio of medians lies above 1, and the ratio exceeds the
+benchmark's threshold. Without samples, or with too few for the test to
+reach significance, only the threshold on the ratio of the reported
+results applies.
+
+The verdict is written as JSON and the exit status is 1 if anything got
+slower, so the gate can stop a CI job. Only the standard library is used.
+
+Usage::
+
+    python tools/regression_gate.py BASE HEAD [--results-dir results]
+        [--thresholds thresholds.json] [--output verdict.json]
+
+``BASE`` and ``HEAD`` are asv result files, or commit hash prefixes looked
+up in the results directory (use ``--base-env``/``--head-env`` to pick an
+environment when a commit has several). The thresholds file maps benchmark
+name patterns (``fnmatch`` style, matched against the full name with its
+parameters) to the allowed slowdown as a fraction; the longest matching
+pattern wins.
+"""
+import argparse
+import fnmatch
+import functools
+import glob
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+
+GATED_PREFIXES = ('time_', 'peakmem_')
+
+
+def load_results(path):
+    """
+    Read an asv result file.
+
+    Returns
+    -------
+    info : dict
+        Commit hash and environment name of the result set.
+    results : dict
+        Map of benchmark name, with parameters, to a ``(value, samples)``
+        tuple. ``value`` is None for failed or skipped benchmarks and
+        ``samples`` is None when asv did not record them.
+    """
+    with open(path) as f_ptr:
+        data = json.load(f_ptr)
+    info = {'file': path, 'commit_hash': data.get('commit_hash'),
+            'env_name': data.get('env_name')}
+    columns = data.get('result_columns')
+    results = {}
+    for name, entry in data.get('results', {}).items():
+        if not name.split('.')[-1].startswith(GATED_PREFIXES):
+            continue
+        if columns is not None:
+            # Result format version 2: one list per benchmark, aligned
+            # with result_columns and possibly truncated.
+            entry = dict(zip(columns, entry))
+        elif not isinstance(entry, dict):
+            entry = {'result': entry}
+        values = entry.get('result')
+        params = entry.get('params') or []
+        samples = entry.get('samples')
+        if not isinstance(values, list):
+            values = [values]
+        labels = ['{}({})'.format(name, ', '.join(combo))
+                  for combo in itertools.product(*params)] if params \
+            else [name]
+        if samples is None:
+            samples = [None] * len(values)
+        for label, value, sample in zip(labels, values, samples):
+            if value is not None and isinstance(value, float) and \
+                    math.isnan(value):
+                value = None
+            results[label] = (value, sample or None)
+    return info, results
+
+
+def find_results(spec, results_dir, machine=None, env=None):
+    """
+    Return the result file for ``spec``: the path itself if it is a file,
+    otherwise the file of the commit starting with ``spec``.
+    """
+    if os.path.isfile(spec):
+        return spec
+    pattern = os.path.join(results_dir, machine or '*', spec + '*.json')
+    matches = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path) as f_ptr:
+            data = json.load(f_ptr)
+        if env is None or data.get('env_name') == env:
+            matches.append(path)
+    if len(matches) != 1:
+        raise ValueError("{} result files match {!r}{}: {}".format(
+            len(matches), spec, '' if env is None else ' in ' + env,
+            ', '.join(matches) or 'none'))
+    return matches[0]
+
+
+# Largest total number of samples for which Mann-Whitney p-values are
+# computed from the exact distribution of U rather than its normal
+# approximation.
+EXACT_MAX_SAMPLES = 40
+
+
+def _ranks(sample1, sample2):
+    """
+    Rank sum of ``sample1`` in the pooled samples, with ties given their
+    mean rank, and the tie correction term ``sum(t**3 - t)``.
+    """
+    pooled = sorted([(value, 0) for value in sample1] +
+                    [(value, 1) for value in sample2])
+    rank_sum = 0.
+    tie_term = 0.
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2. + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1)
+                               if pooled[k][1] == 0)
+        tie_term += (j - i + 1)**3 - (j - i + 1)
+        i = j + 1
+    return rank_sum, tie_term
+
+
+@functools.lru_cache(maxsize=None)
+def u_distribution(n1, n2):
+    """
+    Number of orderings of ``n1 + n2`` distinct values giving each value
+    of U, from 0 to ``n1 * n2``.
+    """
+    # counts[j] is the distribution for i values of the first sample and j
+    # of the second; adding a largest value either to the first sample
+    # (U grows by j) or to the second (U unchanged) builds row i + 1.
+    counts = [[1] for _ in range(n2 + 1)]
+    for i in range(1, n1 + 1):
+        row = [[1]]
+        for j in range(1, n2 + 1):
+            shifted = [0] * j + counts[j]
+            left = row[j - 1]
+            size = max(len(shifted), len(left))
+            row.append([(shifted[k] if k < len(shifted) else 0) +
+                        (left[k] if k < len(left) else 0)
+                        for k in range(size)])
+        counts = row
+    return tuple(counts[n2])
+
+
+def mann_whitney(sample1, sample2):
+    """
+    Two-sided p-value of the Mann-Whitney U test.
+
+    Small samples without ties use the exact distribution of U, the others
+    its normal approximation with a tie correction.
+    """
+    n1, n2 = len(sample1), len(sample2)
+    rank_sum, tie_term = _ranks(sample1, sample2)
+    u = rank_sum - n1 * (n1 + 1) / 2.
+    if tie_term == 0 and n1 + n2 <= EXACT_MAX_SAMPLES:
+        counts = u_distribution(n1, n2)
+        tail = int(round(min(u, n1 * n2 - u)))
+        return min(1., 2. * sum(counts[:tail + 1]) / sum(counts))
+    n = n1 + n2
+    variance = n1 * n2 / 12. * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.
+    z = abs(u - n1 * n2 / 2.) / math.sqrt(variance)
+    return min(1., math.erfc(z / math.sqrt(2)))
+
+
+def smallest_p_value(n1, n2):
+    """
+    Smallest p-value ``mann_whitney`` can give for samples of ``n1`` and
+    ``n2`` values: that of two completely separated samples.
+    """
+    return mann_whitney(range(n1), range(n1, n1 + n2))
+
+
+def bootstrap_ratio(base, head, alpha, n_resamples, rng):
+    """
+    Percentile bootstrap ``1 - alpha`` confidence interval of the ratio of
+    the head and base medians.
+    """
+    ratios = []
+    for _ in range(n_resamples):
+        base_median = statistics.median(rng.choice(base) for _ in base)
+        head_median = statistics.median(rng.choice(head) for _ in head)
+        if base_median > 0:
+            ratios.append(head_median / base_median)
+    if not ratios:
+        return None
+    ratios.sort()
+    low = ratios[int(alpha / 2 * (len(ratios) - 1))]
+    high = ratios[int(math.ceil((1 - alpha / 2) * (len(ratios) - 1)))]
+    return [low, high]
+
+
+def threshold_for(name, thresholds, default):
+    """Allowed slowdown of ``name``: the longest matching pattern wins."""
+    matching = [pattern for pattern in thresholds
+                if fnmatch.fnmatchcase(name, pattern)]
+    if not matching:
+        return default
+    return thresholds[max(matching, key=len)]
+
+
+def compare(name, base, head, threshold, alpha=0.01, n_resamples=2000,
+            min_samples=5, rng=None):
+    """
+    Compare one benchmark, given as ``(value, samples)`` tuples, and return
+    its verdict entry. Benchmarks with fewer than ``min_samples`` samples,
+    or too few for the test to be significant at ``alpha``, are only
+    compared by the ratio of their results.
+    """
+    entry = {'name': name, 'threshold': threshold}
+    if base is None or head is None:
+        entry['verdict'] = 'missing'
+        return entry
+    (base_value, base_samples), (head_value, head_samples) = base, head
+    entry.update(base=base_value, head=head_value)
+    if head_value is None:
+        entry['verdict'] = 'failed' if base_value is not None else 'skipped'
+        return entry
+    if base_value is None:
+        entry['verdict'] = 'new'
+        return entry
+
+    ratio = head_value / base_value if base_value else math.inf
+    entry['ratio'] = ratio
+    slower = ratio > 1 + threshold
+    faster = ratio < 1 / (1 + threshold)
+    # The test is only worth running if the samples are large enough for
+    # it to reach significance at all; otherwise fall back to the ratio.
+    if (base_samples and head_samples and len(base_samples) >= min_samples
+            and len(head_samples) >= min_samples and
+            smallest_p_value(len(base_samples), len(head_samples)) < alpha):
+        p_value = mann_whitney(base_samples, head_samples)
+        interval = bootstrap_ratio(base_samples, head_samples, alpha,
+                                   n_resamples, rng or random.Random(0))
+        entry.update(method='mann-whitney', p_value=p_value, ci=interval)
+        significant = p_value < alpha and interval is not None
+        slower = slower and significant and interval[0] > 1
+        faster = faster and significant and interval[1] < 1
+    else:
+        entry['method'] = 'ratio'
+    entry['verdict'] = 'slower' if slower else \
+        'faster' if faster else 'unchanged'
+    return entry
+
+
+def gate(base_results, head_results, thresholds=None, default_threshold=0.1,
+         alpha=0.01, n_resamples=2000, seed=0):
+    """
+    Compare all benchmarks of two result sets, as returned by
+    ``load_results``. Returns the list of verdict entries.
+    """
+    thresholds = thresholds or {}
+    rng = random.Random(seed)
+    return [compare(name, base_results.get(name), head_results.get(name),
+                    threshold_for(name, thresholds, default_threshold),
+                    alpha=alpha, n_resamples=n_resamples, rng=rng)
+            for name in sorted(set(base_results) | set(head_results))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare two asv result sets and fail on slowdowns.")
+    parser.add_argument('base', help="base result file or commit hash")
+    parser.add_argument('head', help="head result file or commit hash")
+    parser.add_argument('--results-dir', default='results')
+    parser.add_argument('--machine', help="asv machine name")
+    parser.add_argument('--base-env', help="environment of the base results")
+    parser.add_argument('--head-env', help="environment of the head results")
+    parser.add_argument('--thresholds',
+                        help="JSON file of per-benchmark thresholds")
+    parser.add_argument('--default-threshold', type=float, default=0.1,
+                        help="allowed slowdown as a fraction (0.1)")
+    parser.add_argument('--alpha', type=float, default=0.01,
+                        help="significance level (0.01)")
+    parser.add_argument('--bootstrap', type=int, default=2000,
+                        help="number of bootstrap resamples (2000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the verdict to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        base_file = find_results(args.base, args.results_dir, args.machine,
+                                 args.base_env)
+        head_file = find_results(args.head, args.results_dir, args.machine,
+                                 args.head_env)
+    except ValueError as error:
+        parser.error(str(error))
+    thresholds = {}
+    if args.thresholds:
+        with open(args.thresholds) as f_ptr:
+            thresholds = json.load(f_ptr)
+
+    base_info, base_results = load_results(base_file)
+    head_info, head_results = load_results(head_file)
+    entries = gate(base_results, head_results, thresholds,
+                   args.default_threshold, args.alpha, args.bootstrap,
+                   args.seed)
+    summary = {}
+    for entry in entries:
+        summary[entry['verdict']] = summary.get(entry['verdict'], 0) + 1
+    regressed = [entry for entry in entries
+                 if entry['verdict'] in ('slower', 'failed')]
+    verdict = {'base': base_info, 'head': head_info, 'alpha': args.alpha,
+               'default_threshold': args.default_threshold,
+               'summary': summary, 'regressed': bool(regressed),
+               'benchmarks': entries}
+
+    if args.output:
+        with open(args.output, 'w') as f_ptr:
+            json.dump(verdict, f_ptr, indent=2)
+    else:
+        json.dump(verdict, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    for entry in regressed:
+        sys.stderr.write('{}: {} ({})\n'.format(
+            entry['verdict'], entry['name'],
+            'x{:.2f}'.format(entry['ratio']) if 'ratio' in entry
+            else 'no result'))
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Tests of the statistics of ``regression_gate``."""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import regression_gate as gate  # noqa: E402
+
+FAST = [1.0, 0.99, 1.01, 1.02, 0.98]
+SLOW = [1.5, 1.49, 1.51, 1.52, 1.48]
+
+
+class TestMannWhitney(unittest.TestCase):
+    def test_u_distribution(self):
+        counts = gate.u_distribution(2, 2)
+        # Orderings of aabb: U = 0, 1, 2, 2, 3, 4.
+        self.assertEqual(counts, (1, 1, 2, 1, 1))
+        # One count per choice of 5 positions out of 10.
+        self.assertEqual(sum(gate.u_distribution(5, 5)), 252)
+
+    def test_separated_samples(self):
+        self.assertAlmostEqual(gate.mann_whitney(FAST, SLOW), 2 / 252)
+        self.assertAlmostEqual(gate.smallest_p_value(5, 5), 2 / 252)
+
+    def test_symmetric(self):
+        rng = random.Random(1)
+        sample1 = [rng.random() for _ in range(7)]
+        sample2 = [rng.random() + 0.2 for _ in range(9)]
+        self.assertAlmostEqual(gate.mann_whitney(sample1, sample2),
+                               gate.mann_whitney(sample2, sample1))
+
+    def test_identical_samples(self):
+        self.assertEqual(gate.mann_whitney([1, 2, 3], [1, 2, 3]), 1.)
+        self.assertEqual(gate.mann_whitney([1] * 6, [1] * 6), 1.)
+
+    def test_normal_approximation(self):
+        # Ties force the normal approximation; separated samples of this
+        # size are still clearly significant.
+        self.assertLess(gate.mann_whitney([1, 1, 2] * 10, [5, 5, 6] * 10),
+                        1e-6)
+
+
+class TestBootstrap(unittest.TestCase):
+    def test_interval(self):
+        low, high = gate.bootstrap_ratio(FAST, SLOW, 0.01, 500,
+                                         random.Random(0))
+        self.assertLess(low, 1.5)
+        self.assertGreater(low, 1.4)
+        self.assertGreater(high, 1.5)
+
+
+class TestCompare(unittest.TestCase):
+    def test_slower_with_five_samples(self):
+        entry = gate.compare('bench', (1.0, FAST), (1.5, SLOW), 0.1)
+        self.assertEqual(entry['method'], 'mann-whitney')
+        self.assertEqual(entry['verdict'], 'slower')
+
+    def test_unchanged_within_noise(self):
+        entry = gate.compare('bench', (1.0, FAST), (1.01, FAST[::-1]), 0.1)
+        self.assertEqual(entry['verdict'], 'unchanged')
+
+    def test_too_few_samples_falls_back_to_ratio(self):
+        entry = gate.compare('bench', (1.0, FAST[:4]), (1.5, SLOW[:4]), 0.1)
+        self.assertEqual(entry['method'], 'ratio')
+        self.assertEqual(entry['verdict'], 'slower')
+
+    def test_missing_and_new(self):
+        self.assertEqual(gate.compare('bench', None, (1., None), 0.1)
+                         ['verdict'], 'missing')
+        self.assertEqual(gate.compare('bench', (None, None), (1., None),
+                                      0.1)['verdict'], 'new')
+
+    def test_threshold_for(self):
+        thresholds = {'bench_*': 0.2, 'bench_Large.*': 0.5}
+        self.assertEqual(gate.threshold_for('bench_Large.time_x', thresholds,
+                                            0.1), 0.5)
+        self.assertEqual(gate.threshold_for('other', thresholds, 0.1), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()